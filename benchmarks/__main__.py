@@ -0,0 +1,93 @@
+# Copyright 2024 The CUE Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# 	http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Run the benchmark suite.
+
+    python -m benchmarks [-o results.json] [--compare baseline.json] [-k pattern] [module ...]
+
+Runs every benchmarks.bench_* module, or only those named, prints the
+results and optionally writes them to a JSON file. Passing a previous
+results file with --compare prints the change for each benchmark.
+"""
+
+from dataclasses import asdict
+from typing import Any, Dict, List
+from benchmarks.harness import Measurement, report
+import argparse
+import datetime
+import importlib
+import json
+import pkgutil
+import platform
+import re
+import sys
+import benchmarks
+import libcue
+
+def modules() -> List[str]:
+    return sorted(m.name for m in pkgutil.iter_modules(benchmarks.__path__) if m.name.startswith("bench_"))
+
+def metadata() -> Dict[str, Any]:
+    return {
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "api_mode": libcue.API_MODE,
+    }
+
+def compare(results: List[Measurement], baseline: Dict[str, Any]) -> None:
+    old = {r["name"]: r for r in baseline["results"]}
+    for r in results:
+        b = old.get(r.name)
+        if b is None or b["seconds"] <= 0 or r.seconds <= 0:
+            continue
+        change = (r.seconds - b["seconds"]) / b["seconds"] * 100
+        print(f"{r.name:<48} {change:+7.1f}%")
+
+def main(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Run the cue-py benchmarks.")
+    parser.add_argument("modules", nargs="*", help="benchmark modules to run, such as bench_ffi (default: all)")
+    parser.add_argument("-o", "--output", help="write results as JSON to this file")
+    parser.add_argument("-k", "--filter", help="only report benchmarks whose name matches this regular expression")
+    parser.add_argument("--compare", help="compare with results previously written with -o")
+    args = parser.parse_args(argv)
+
+    names = args.modules or modules()
+    unknown = set(names) - set(modules())
+    if unknown:
+        parser.error(f"unknown benchmark modules: {', '.join(sorted(unknown))}")
+
+    results: List[Measurement] = []
+    for name in names:
+        mod = importlib.import_module(f"benchmarks.{name}")
+        rs = [r for r in mod.run() if not args.filter or re.search(args.filter, r.name)]
+        report(rs)
+        results += rs
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"metadata": metadata(), "results": [asdict(r) for r in results]}, f, indent=2)
+            f.write("\n")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        print()
+        compare(results, baseline)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
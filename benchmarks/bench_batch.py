@@ -0,0 +1,69 @@
+# Copyright 2024 The CUE Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# 	http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Validating many records against one schema.
+
+Compares calling Value.check_schema per record with Value.check_many,
+for records given as Python objects, JSON bytes and Values.
+
+    python -m benchmarks.bench_batch
+"""
+
+from typing import Any, List
+from benchmarks.harness import Measurement, measure, report
+import cue
+import json
+
+SCHEMA = """
+{
+	id!:   int & >=0
+	name!: string
+	tags?: [...string]
+	ratio: number | *0
+}
+"""
+
+def records(n: int) -> List[Any]:
+    return [{"id": i, "name": f"item {i}", "tags": ["a", "b"], "ratio": 0.5} for i in range(n)]
+
+def run() -> List[Measurement]:
+    ctx = cue.Context()
+    schema = ctx.compile(SCHEMA)
+    opts = (cue.Concrete(True),)
+    n = 1000
+
+    objs = records(n)
+    datas = [json.dumps(r).encode("utf-8") for r in objs]
+    vals = [ctx.to_value(r) for r in objs]
+
+    def loop(recs: List[Any]):
+        for r in recs:
+            if not isinstance(r, cue.Value):
+                r = ctx.compile(r) if isinstance(r, bytes) else ctx.to_value(r)
+            r.check_schema(schema, *opts)
+
+    results = []
+    for kind, recs in (("objects", objs), ("json", datas), ("values", vals)):
+        for name, fn in (
+            ("check_schema", lambda: loop(recs)),
+            ("check_many", lambda: schema.check_many(recs, *opts)),
+        ):
+            m = measure(f"batch/{name}/{kind}/{n}", fn, repeat=3)
+            m.extra["records/s"] = n / m.seconds
+            results.append(m)
+    return results
+
+if __name__ == "__main__":
+    report(run())
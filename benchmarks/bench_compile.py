@@ -0,0 +1,47 @@
+# Copyright 2024 The CUE Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# 	http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Compiling CUE sources.
+
+Measures compiling small and large sources from str and bytes, and
+with the compile cache enabled.
+
+    python -m benchmarks.bench_compile
+"""
+
+from typing import List
+from benchmarks.bench_export import source
+from benchmarks.harness import Measurement, measure, report
+import cue
+
+def run() -> List[Measurement]:
+    ctx = cue.Context()
+    cached = cue.Context(compile_cache_size=16)
+
+    results = []
+    for label, src in (("small", "x: { a: int, b: string | *\"b\" }"), ("large", source(5000))):
+        b = src.encode("utf-8")
+        for name, fn in (
+            ("str", lambda: ctx.compile(src)),
+            ("bytes", lambda: ctx.compile(b)),
+            ("cached", lambda: cached.compile(src)),
+        ):
+            m = measure(f"compile/{name}/{label}", fn, repeat=3)
+            m.extra["MB/s"] = len(b) / m.seconds / 1e6
+            results.append(m)
+    return results
+
+if __name__ == "__main__":
+    report(run())
@@ -0,0 +1,52 @@
+# Copyright 2024 The CUE Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# 	http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Decoding scalar values.
+
+Measures each Value.to_* converter, and for reference the cost of
+allocating an out-parameter with ffi.new, which the converters avoid
+by reusing per-thread scratch space.
+
+    python -m benchmarks.bench_decode
+"""
+
+from typing import List
+from benchmarks.harness import Measurement, measure, report
+import cue
+import libcue
+
+def run() -> List[Measurement]:
+    ctx = cue.Context()
+    i = ctx.compile("-42")
+    u = ctx.compile("0xcafebabe")
+    b = ctx.compile("true")
+    f = ctx.compile("1.2345")
+    s = ctx.compile('"hello, world"')
+    by = ctx.compile("'hello, world'")
+    j = ctx.compile('x: { a: 1, b: "two", c: [3] }')
+
+    return [
+        measure("decode/ffi.new(int64_t*)", lambda: libcue.ffi.new("int64_t*")),
+        measure("decode/to_int", i.to_int),
+        measure("decode/to_unsigned", u.to_unsigned),
+        measure("decode/to_bool", b.to_bool),
+        measure("decode/to_float", f.to_float),
+        measure("decode/to_str", s.to_str),
+        measure("decode/to_bytes", by.to_bytes),
+        measure("decode/to_json", j.to_json),
+    ]
+
+if __name__ == "__main__":
+    report(run())
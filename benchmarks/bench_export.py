@@ -0,0 +1,60 @@
+# Copyright 2024 The CUE Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# 	http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Exporting CUE values to Python objects.
+
+Compares Value.to_python with the to_json and json.loads round-trip,
+and the JSON exports to str, bytes and a preallocated buffer, for
+documents of increasing size.
+
+    python -m benchmarks.bench_export
+"""
+
+from typing import List
+from benchmarks.harness import Measurement, measure, report
+import cue
+import json
+
+def source(n: int) -> str:
+    """
+    A CUE struct with n entries, each a small nested struct.
+    """
+    fields = ",\n".join(
+        f'f{i}: {{ id: {i}, name: "item {i}", ratio: {i}.5, tags: ["a", "b"], ok: true }}'
+        for i in range(n))
+    return "{\n" + fields + "\n}"
+
+def run() -> List[Measurement]:
+    ctx = cue.Context()
+    results = []
+    for n in (10, 1000, 10000):
+        val = ctx.compile(source(n))
+        size = len(val.to_json())
+        out = bytearray(size)
+
+        for name, fn in (
+            ("to_json+json.loads", lambda: json.loads(val.to_json())),
+            ("to_python", lambda: val.to_python()),
+            ("to_json+encode", lambda: val.to_json().encode("utf-8")),
+            ("to_json_bytes", lambda: val.to_json_bytes()),
+            ("write_json", lambda: val.write_json(out)),
+        ):
+            m = measure(f"export/{name}/{n}", fn)
+            m.extra["MB/s"] = size / m.seconds / 1e6
+            results.append(m)
+    return results
+
+if __name__ == "__main__":
+    report(run())
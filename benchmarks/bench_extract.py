@@ -0,0 +1,61 @@
+# Copyright 2024 The CUE Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# 	http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Extracting many fields from a value.
+
+Compares lookup and to_* calls per field with a single Value.extract.
+
+    python -m benchmarks.bench_extract
+"""
+
+from typing import Dict, List
+from benchmarks.harness import Measurement, measure, report
+import cue
+
+KINDS = [cue.Kind.INT, cue.Kind.STRING, cue.Kind.BOOL, cue.Kind.FLOAT]
+
+def run() -> List[Measurement]:
+    ctx = cue.Context()
+    n = 30
+    values = ['42', '"hello"', 'true', '0.5']
+    src = "\n".join(f"f{i}: {values[i % 4]}" for i in range(n))
+    val = ctx.compile(src)
+
+    fields: Dict[str | cue.Path, cue.Kind] = {f"f{i}": KINDS[i % 4] for i in range(n)}
+    paths: Dict[str | cue.Path, cue.Kind] = {ctx.path(f"f{i}"): KINDS[i % 4] for i in range(n)}
+
+    def per_field():
+        out = {}
+        for i in range(n):
+            v = val.lookup(f"f{i}")
+            match KINDS[i % 4]:
+                case cue.Kind.INT:
+                    out[i] = v.to_int()
+                case cue.Kind.STRING:
+                    out[i] = v.to_str()
+                case cue.Kind.BOOL:
+                    out[i] = v.to_bool()
+                case cue.Kind.FLOAT:
+                    out[i] = v.to_float()
+        return out
+
+    return [
+        measure(f"extract/lookup+to_*/{n}", per_field),
+        measure(f"extract/extract(str)/{n}", lambda: val.extract(fields)),
+        measure(f"extract/extract(Path)/{n}", lambda: val.extract(paths)),
+    ]
+
+if __name__ == "__main__":
+    report(run())
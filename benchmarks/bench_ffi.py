@@ -0,0 +1,76 @@
+# Copyright 2024 The CUE Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# 	http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Per-call overhead of the ABI-mode and API-mode libcue bindings.
+
+Both modes are loaded side by side and call the same functions on
+the same kind of values, so the difference is the cost of crossing
+into libcue.
+
+    python -m benchmarks.bench_ffi
+"""
+
+from typing import Any, List, Tuple
+from cffi import FFI
+from benchmarks.harness import Measurement, measure, report
+import libcue
+
+def _abi_mode() -> Tuple[Any, Any]:
+    ffi = FFI()
+    ffi.cdef(libcue.CDEF)
+    return ffi, ffi.dlopen(libcue.libcue_so)
+
+def _api_mode() -> Tuple[Any, Any]:
+    from libcue._libcue import ffi, lib # type: ignore[import-not-found]
+    return ffi, lib
+
+def _bench(mode: str, ffi: Any, lib: Any) -> List[Measurement]:
+    ctx = lib.cue_newctx()
+    val_ptr = ffi.new("cue_value*")
+    err = lib.cue_compile_string(ctx, ffi.new("char[]", b"x: y: 42"), ffi.NULL, val_ptr)
+    assert err == 0
+    val = val_ptr[0]
+
+    path = ffi.new("char[]", b"x.y")
+    err = lib.cue_lookup_string(val, path, val_ptr)
+    assert err == 0
+    leaf = val_ptr[0]
+
+    int_ptr = ffi.new("int64_t*")
+
+    def lookup():
+        lib.cue_lookup_string(val, path, val_ptr)
+        lib.cue_free(val_ptr[0])
+
+    results = [
+        measure(f"{mode}/cue_concrete_kind", lambda: lib.cue_concrete_kind(leaf)),
+        measure(f"{mode}/cue_dec_int64", lambda: lib.cue_dec_int64(leaf, int_ptr)),
+        measure(f"{mode}/cue_lookup_string+cue_free", lookup),
+    ]
+
+    for h in (leaf, val, ctx):
+        lib.cue_free(h)
+    return results
+
+def run() -> List[Measurement]:
+    results = _bench("abi", *_abi_mode())
+    if libcue.API_MODE:
+        results += _bench("api", *_api_mode())
+    else:
+        print("API-mode extension not built, see libcue/build.py")
+    return results
+
+if __name__ == "__main__":
+    report(run())
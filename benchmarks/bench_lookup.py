@@ -0,0 +1,48 @@
+# Copyright 2024 The CUE Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# 	http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Looking up values by path.
+
+Compares lookups by str, by precompiled Path and with lookup_many,
+for paths of increasing depth.
+
+    python -m benchmarks.bench_lookup
+"""
+
+from typing import List
+from benchmarks.harness import Measurement, measure, report
+import cue
+
+def source(depth: int) -> str:
+    return ": ".join(f"f{i}" for i in range(depth)) + ": 42"
+
+def run() -> List[Measurement]:
+    ctx = cue.Context()
+    results = []
+    for depth in (1, 4, 16):
+        val = ctx.compile(source(depth))
+        s = ".".join(f"f{i}" for i in range(depth))
+        p = ctx.path(s)
+        paths = [p] * 50
+
+        results += [
+            measure(f"lookup/str/depth={depth}", lambda: val.lookup(s)),
+            measure(f"lookup/Path/depth={depth}", lambda: val.lookup(p)),
+            measure(f"lookup/lookup_many(50)/depth={depth}", lambda: val.lookup_many(paths)),
+        ]
+    return results
+
+if __name__ == "__main__":
+    report(run())
@@ -0,0 +1,70 @@
+# Copyright 2024 The CUE Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# 	http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Memory held by live Values.
+
+Reports the Python-side bytes per live Value, as measured by
+tracemalloc, for the current layout and for the previous layout, in
+which a Value with a __dict__ held a separate _Resource with its own
+__dict__. Memory held by libcue on the Go side is not included.
+
+    python -m benchmarks.bench_memory
+"""
+
+from typing import Any, Callable, List
+from benchmarks.harness import Measurement, report
+import cue
+import gc
+import tracemalloc
+
+N = 100_000
+
+class _LegacyResource:
+    def __init__(self, v: int):
+        self._val = v
+
+class _LegacyValue:
+    def __init__(self, ctx: Any, v: int):
+        self._ctx = ctx
+        self._val = _LegacyResource(v)
+
+def bytes_per_object(make: Callable[[int], Any]) -> float:
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objs = [make(i) for i in range(N)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    # do not count the list holding the objects.
+    size = after - before - (objs.__sizeof__())
+    del objs
+    return size / N
+
+def run() -> List[Measurement]:
+    ctx = cue.Context()
+    results = []
+    for name, make in (
+        ("legacy(Value+_Resource)", lambda i: _LegacyValue(ctx, i + 2**40)),
+        ("Value", lambda i: ctx.to_value(i)),
+    ):
+        m = Measurement(f"memory/{name}", 0.0, N, 1)
+        m.extra["bytes/value"] = bytes_per_object(make)
+        results.append(m)
+    ctx.flush()
+    return results
+
+if __name__ == "__main__":
+    report(run())
@@ -0,0 +1,48 @@
+# Copyright 2024 The CUE Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# 	http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Encoding evaluation and build options.
+
+Compares the cached encoding of option arrays with encoding them
+afresh, and the cost of a validate call with options.
+
+    python -m benchmarks.bench_opts
+"""
+
+from typing import List
+from benchmarks.harness import Measurement, measure, report
+from cue.build import _encode_build_opts
+from cue.eval import _encode_eval_opts, encode_eval_opts
+import cue
+import libcue
+
+def run() -> List[Measurement]:
+    eopts = (cue.Concrete(True), cue.Final(), cue.Definitions(False))
+    bopts = (cue.FileName("schema.cue"), cue.ImportPath("example.com/schema"))
+
+    ctx = cue.Context()
+    val = ctx.compile("x: 1")
+
+    return [
+        measure("opts/encode_eval_opts/uncached", lambda: _encode_eval_opts.__wrapped__(eopts)),
+        measure("opts/encode_eval_opts/cached", lambda: encode_eval_opts(*eopts)),
+        measure("opts/encode_build_opts/uncached", lambda: _encode_build_opts.__wrapped__(bopts)),
+        measure("opts/encode_build_opts/cached", lambda: _encode_build_opts(bopts)),
+        measure("opts/validate/uncached", lambda: libcue.validate(val._res(), _encode_eval_opts.__wrapped__(eopts))),
+        measure("opts/validate/cached", lambda: val.validate(*eopts)),
+    ]
+
+if __name__ == "__main__":
+    report(run())
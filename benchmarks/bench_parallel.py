@@ -0,0 +1,47 @@
+# Copyright 2024 The CUE Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# 	http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Scaling of ValidationPool with the number of worker processes.
+
+    python -m benchmarks.bench_parallel
+"""
+
+from typing import List
+from benchmarks.bench_batch import SCHEMA, records
+from benchmarks.harness import Measurement, measure, report
+from cue.parallel import ValidationPool
+import cue
+import json
+import os
+
+def run() -> List[Measurement]:
+    n = 20000
+    datas = [json.dumps(r).encode("utf-8") for r in records(n)]
+
+    cpus = os.cpu_count() or 1
+    counts = sorted({1, cpus} | {w for w in (2, 4, 8, 16, 32) if w < cpus})
+
+    results = []
+    for workers in counts:
+        with ValidationPool(SCHEMA, eval_opts=[cue.Concrete(True)], workers=workers, chunksize=500) as pool:
+            # start the workers before timing.
+            pool.check_batch(datas[:workers * 500])
+            m = measure(f"parallel/check_batch/workers={workers}/{n}", lambda: pool.check_batch(datas), repeat=3)
+        m.extra["records/s"] = n / m.seconds
+        results.append(m)
+    return results
+
+if __name__ == "__main__":
+    report(run())
@@ -0,0 +1,56 @@
+# Copyright 2024 The CUE Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# 	http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Creating and releasing handles.
+
+Measures the throughput of creating values and releasing their
+handles through garbage collection (batched), close (one call each)
+and arenas.
+
+    python -m benchmarks.bench_resource
+"""
+
+from typing import List
+from benchmarks.harness import Measurement, measure, report
+import cue
+
+N = 1000
+
+def run() -> List[Measurement]:
+    ctx = cue.Context()
+
+    def gc():
+        for i in range(N):
+            ctx.to_value(i)
+        ctx.flush()
+
+    def close():
+        for i in range(N):
+            ctx.to_value(i).close()
+
+    def arena():
+        with ctx.arena():
+            for i in range(N):
+                ctx.to_value(i)
+
+    results = []
+    for name, fn in (("gc", gc), ("close", close), ("arena", arena)):
+        m = measure(f"resource/create+{name}/{N}", fn)
+        m.extra["handles/s"] = N / m.seconds
+        results.append(m)
+    return results
+
+if __name__ == "__main__":
+    report(run())
@@ -0,0 +1,40 @@
+# Copyright 2024 The CUE Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# 	http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Round-tripping scalars through CUE.
+
+Measures Context.to_value followed by the matching Value.to_*
+converter for each scalar type.
+
+    python -m benchmarks.bench_roundtrip
+"""
+
+from typing import List
+from benchmarks.harness import Measurement, measure, report
+import cue
+
+def run() -> List[Measurement]:
+    ctx = cue.Context()
+    return [
+        measure("roundtrip/int", lambda: ctx.to_value(-42).to_int()),
+        measure("roundtrip/unsigned", lambda: ctx.to_value_from_unsigned(0xcafebabe).to_unsigned()),
+        measure("roundtrip/bool", lambda: ctx.to_value(True).to_bool()),
+        measure("roundtrip/float", lambda: ctx.to_value(1.2345).to_float()),
+        measure("roundtrip/str", lambda: ctx.to_value("hello, world").to_str()),
+        measure("roundtrip/bytes", lambda: ctx.to_value(b"hello, world").to_bytes()),
+    ]
+
+if __name__ == "__main__":
+    report(run())
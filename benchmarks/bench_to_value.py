@@ -0,0 +1,54 @@
+# Copyright 2024 The CUE Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# 	http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Converting Python trees to CUE values.
+
+Compares Context.to_value on dicts with serializing to JSON and
+compiling the result, for payloads of about 1 KB, 100 KB and 10 MB.
+
+    python -m benchmarks.bench_to_value
+"""
+
+from typing import Any, Dict, List
+from benchmarks.harness import Measurement, measure, report
+import cue
+import json
+
+def payload(size: int) -> Dict[str, Any]:
+    """
+    A dict whose JSON encoding is about size bytes.
+    """
+    record = {"id": 1234, "name": "item", "ratio": 0.5, "tags": ["a", "b"], "ok": True, "parent": None}
+    n = max(1, size // len(json.dumps(record)))
+    return {"items": [dict(record, id=i) for i in range(n)]}
+
+def run() -> List[Measurement]:
+    ctx = cue.Context()
+    results = []
+    for label, size in (("1KB", 1_000), ("100KB", 100_000), ("10MB", 10_000_000)):
+        obj = payload(size)
+        nbytes = len(json.dumps(obj))
+
+        for name, fn in (
+            ("json.dumps+compile", lambda: ctx.compile(json.dumps(obj))),
+            ("to_value", lambda: ctx.to_value(obj)),
+        ):
+            m = measure(f"to_value/{name}/{label}", fn, repeat=3)
+            m.extra["MB/s"] = nbytes / m.seconds / 1e6
+            results.append(m)
+    return results
+
+if __name__ == "__main__":
+    report(run())
@@ -0,0 +1,41 @@
+# Copyright 2024 The CUE Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# 	http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Unifying chains of values.
+
+    python -m benchmarks.bench_unify
+"""
+
+from typing import List
+from benchmarks.harness import Measurement, measure, report
+import cue
+
+def run() -> List[Measurement]:
+    ctx = cue.Context()
+    results = []
+    for n in (2, 8, 32):
+        vals = [ctx.compile(f"f{i}: int, f{i}: {i}, common: string") for i in range(n)]
+
+        def chain():
+            v = vals[0]
+            for w in vals[1:]:
+                v = v.unify(w)
+            return v
+
+        results.append(measure(f"unify/chain/{n}", chain))
+    return results
+
+if __name__ == "__main__":
+    report(run())
@@ -0,0 +1,44 @@
+# Copyright 2024 The CUE Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# 	http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Validating single values.
+
+Measures Value.validate and Value.check_schema on values of
+increasing size.
+
+    python -m benchmarks.bench_validate
+"""
+
+from typing import List
+from benchmarks.harness import Measurement, measure, report
+import cue
+
+def run() -> List[Measurement]:
+    ctx = cue.Context()
+    schema = ctx.compile("[string]: { id: int, name: string, tags: [...string] }")
+    concrete = cue.Concrete(True)
+
+    results = []
+    for n in (1, 100, 10000):
+        src = "\n".join(f'f{i}: {{ id: {i}, name: "item {i}", tags: ["a"] }}' for i in range(n))
+        val = ctx.compile(src)
+        results += [
+            measure(f"validate/validate/{n}", lambda: val.validate(concrete)),
+            measure(f"validate/check_schema/{n}", lambda: val.check_schema(schema, concrete)),
+        ]
+    return results
+
+if __name__ == "__main__":
+    report(run())
@@ -0,0 +1,54 @@
+# Copyright 2024 The CUE Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# 	http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+The validation cache.
+
+Compares checks with and without Context(validation_cache_size=...),
+where every cached check is a hit: Value.check_schema on the same
+Value, and validate_batch on repeated Python objects and JSON
+documents.
+
+    python -m benchmarks.bench_validation_cache
+"""
+
+from typing import Any, List
+from benchmarks.harness import Measurement, measure, report
+import cue
+import json
+
+SCHEMA = "[string]: { id: int, name: string, tags: [...string] }"
+
+def run() -> List[Measurement]:
+    results = []
+    for cached in (False, True):
+        ctx = cue.Context(validation_cache_size=1024 if cached else 0)
+        schema = ctx.compile(SCHEMA)
+        concrete = cue.Concrete(True)
+        mode = "hit" if cached else "uncached"
+
+        for n in (1, 100):
+            val = ctx.compile("\n".join(f'f{i}: {{ id: {i}, name: "item {i}", tags: ["a"] }}' for i in range(n)))
+            results.append(measure(f"validation_cache/check_schema/{mode}/{n}", lambda: val.check_schema(schema, concrete)))
+
+        objs: List[Any] = [{"f": {"id": i % 10, "name": f"item {i % 10}", "tags": ["a"]}} for i in range(1000)]
+        datas: List[Any] = [json.dumps(r).encode("utf-8") for r in objs]
+        for kind, recs in (("objects", objs), ("json", datas)):
+            m = measure(f"validation_cache/batch/{kind}/{mode}/{len(recs)}", lambda: ctx.validate_batch(schema, recs, concrete), repeat=3)
+            m.extra["records/s"] = len(recs) / m.seconds
+            results.append(m)
+    return results
+
+if __name__ == "__main__":
+    report(run())
@@ -0,0 +1,61 @@
+# Copyright 2024 The CUE Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# 	http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Timing helpers shared by the benchmarks.
+"""
+
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable
+import timeit
+
+@dataclass
+class Measurement:
+    """
+    The result of a benchmark.
+
+    Args:
+        name: benchmark name.
+        seconds: best time per call, in seconds.
+        number: calls per timed repetition.
+        repeat: number of timed repetitions.
+        extra: derived metrics, such as throughput.
+    """
+    name: str
+    seconds: float
+    number: int
+    repeat: int
+    extra: Dict[str, float] = field(default_factory=dict)
+
+def measure(name: str, fn: Callable[[], object], repeat: int = 5) -> Measurement:
+    """
+    Time fn, choosing the number of calls per repetition automatically.
+    """
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    best = min(timer.repeat(repeat=repeat, number=number)) / number
+    return Measurement(name, best, number, repeat)
+
+def format_seconds(s: float) -> str:
+    for unit, scale in (("s", 1.0), ("ms", 1e-3), ("us", 1e-6)):
+        if s >= scale:
+            return f"{s / scale:.3f} {unit}"
+    return f"{s / 1e-9:.1f} ns"
+
+def report(results: Iterable[Measurement]) -> None:
+    for r in results:
+        extra = "".join(f"  {k}={v:.6g}" for k, v in r.extra.items())
+        # measurements of things other than time leave seconds unset.
+        t = f"{format_seconds(r.seconds):>12}/call" if r.seconds > 0 else " " * 17
+        print(f"{r.name:<48} {t}{extra}")
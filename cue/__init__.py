@@ -29,6 +29,9 @@ Multiple values involved in some operation must use the same Context.
 For more information about the CUE language see https://cuelang.org.
 """
 
+from . import debug
+from .arena import Arena
+from .batch import BatchResult
 from .build import (
     BuildOption,
     FileName,
@@ -36,6 +39,7 @@ from .build import (
     InferBuiltins,
     Scope,
 )
+from .cache import CacheInfo
 from .context import Context
 from .error import Error
 from .eval import (
@@ -55,17 +59,44 @@ from .eval import (
     Schema,
 )
 from .kind import Kind
+from .path import Path
+from .profile import (
+    CallStats,
+    Profile,
+    profile,
+    profiling_enabled,
+    reset_stats,
+    set_profiling,
+    stats,
+)
+from .registry import (
+    RegisteredSchema,
+    RegistryStats,
+    SchemaRegistry,
+)
 from .result import (
     Err,
     Ok,
     Result,
 )
+from .trace import (
+    RecordedSpan,
+    RecordingTracer,
+    Span,
+    Tracer,
+    get_tracer,
+    set_tracer,
+)
 from .value import Value
 
 __all__ = [
     'All',
+    'Arena',
     'Attributes',
+    'BatchResult',
     'BuildOption',
+    'CacheInfo',
+    'CallStats',
     'Concrete',
     'Context',
     'Definitions',
@@ -84,9 +115,25 @@ __all__ = [
     'Kind',
     'Ok',
     'Optionals',
+    'Path',
+    'Profile',
     'Raw',
+    'RecordedSpan',
+    'RecordingTracer',
+    'RegisteredSchema',
+    'RegistryStats',
     'Result',
     'Schema',
+    'SchemaRegistry',
     'Scope',
+    'Span',
+    'Tracer',
     'Value',
+    'get_tracer',
+    'profile',
+    'profiling_enabled',
+    'reset_stats',
+    'set_profiling',
+    'set_tracer',
+    'stats',
 ]
@@ -0,0 +1,175 @@
+# Copyright 2024 The CUE Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# 	http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Command line interface.
+
+    python -m cue validate [-j N] [-c] schema.cue data.jsonl...
+
+validate checks every line of newline-delimited JSON files against a
+CUE schema. Input is streamed, so files of any size are checked in
+constant memory. Lines that are not JSON are reported as errors,
+unless --cue is given, in which case each line may be any CUE value.
+Each record that does not conform is reported as
+
+    data.jsonl:LINE: message
+
+followed by a summary of the throughput on stderr. The exit status
+is 0 if all records conform, 1 if some do not, and 2 if the schema
+or an input can not be read.
+"""
+
+from collections import deque
+from contextlib import nullcontext
+from typing import BinaryIO, Callable, ContextManager, Deque, Iterable, Iterator, List, Optional, TextIO, Tuple
+from cue.batch import BatchResult, _JSONDocument
+from cue.build import FileName
+from cue.context import Context
+from cue.error import Error
+from cue.eval import Concrete, EvalOption
+from cue.parallel import ValidationPool, _chunks
+from cue.value import Value
+import argparse
+import os
+import sys
+import time
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m cue", description="Use CUE from the command line.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    validate = sub.add_parser("validate", help="validate JSONL records against a schema",
+                              description="Validate each line of newline-delimited JSON files against a CUE schema.")
+    validate.add_argument("schema", help="CUE file holding the schema")
+    validate.add_argument("data", nargs="+", help="JSONL files to validate, or - for stdin")
+    validate.add_argument("-j", "--jobs", type=int, default=1,
+                          help="number of worker processes, 0 for one per CPU (default: 1)")
+    validate.add_argument("-c", "--concrete", action="store_true", help="require records to be concrete")
+    validate.add_argument("--chunksize", type=int, default=256, help="records checked per batch (default: 256)")
+    validate.add_argument("--cue", action="store_true", help="accept lines of CUE, not only JSON")
+    validate.add_argument("-q", "--quiet", action="store_true", help="do not report individual errors")
+
+    args = parser.parse_args(argv)
+    if args.jobs < 0 or args.chunksize <= 0:
+        parser.error("--jobs must not be negative and --chunksize must be positive")
+    return _validate(args, sys.stdout, sys.stderr)
+
+def _validate(args: argparse.Namespace, out: TextIO, err: TextIO) -> int:
+    try:
+        with open(args.schema, "rb") as sf:
+            schema = sf.read()
+    except OSError as e:
+        print(f"{args.schema}: {e.strerror}", file=err)
+        return 2
+
+    build_opts = (FileName(args.schema),)
+    eval_opts: Tuple[EvalOption, ...] = (Concrete(True),) if args.concrete else ()
+    jobs = args.jobs or os.cpu_count() or 1
+
+    pool: Optional[ValidationPool] = None
+    check: Callable[[Iterable[bytes]], Iterator[BatchResult]]
+    try:
+        if jobs > 1:
+            pool = ValidationPool(schema, *build_opts, eval_opts=eval_opts, workers=jobs, chunksize=args.chunksize)
+            check = pool.validate_chunks
+        else:
+            ctx = Context()
+            val = ctx.compile(schema, *build_opts)
+            check = lambda lines: _check(ctx, val, lines, eval_opts, args.chunksize)
+    except Error as e:
+        print(str(e), file=err)
+        return 2
+
+    records = 0
+    failed = 0
+    size = 0
+    status = 0
+    start = time.perf_counter()
+    try:
+        for name in args.data:
+            f: ContextManager[BinaryIO]
+            try:
+                # only close files opened here, not stdin.
+                if name == "-":
+                    f = nullcontext(sys.stdin.buffer)
+                else:
+                    f = open(name, "rb")
+            except OSError as e:
+                print(f"{name}: {e.strerror}", file=err)
+                status = 2
+                break
+            with f as lines_in:
+                lines = _Lines(lines_in, json_only=not args.cue)
+                for chunk in check(lines):
+                    msgs = dict(chunk.errors)
+                    for i in range(len(chunk)):
+                        lineno = lines.lineno()
+                        msg = msgs.get(i)
+                        if msg is not None and not args.quiet:
+                            msg = msg.replace("\n", "\n    ")
+                            print(f"{name}:{lineno}: {msg}", file=out)
+                    failed += chunk.failed
+                records += lines.records
+                size += lines.bytes
+    finally:
+        if pool is not None:
+            pool.close()
+
+    # report the records checked so far even if an input could not
+    # be opened.
+    elapsed = time.perf_counter() - start
+    rate = records / elapsed if elapsed > 0 else 0.0
+    mbs = size / elapsed / 1e6 if elapsed > 0 else 0.0
+    print(f"{records} records, {failed} failed, in {elapsed:.2f}s ({rate:.0f} records/s, {mbs:.1f} MB/s)", file=err)
+    if status:
+        return status
+    return 1 if failed else 0
+
+class _Lines:
+    """
+    The non-blank lines of a file, remembering the number of each
+    line handed out until its result is taken.
+
+    With json_only, lines are handed out as JSON documents, which are
+    checked to be JSON where they are compiled, so that the check runs
+    in the workers rather than here.
+    """
+
+    def __init__(self, f: Iterable[bytes], json_only: bool):
+        self._f = f
+        self._json_only = json_only
+        self._linenos: Deque[int] = deque()
+        self.records = 0
+        self.bytes = 0
+
+    def __iter__(self) -> Iterator[bytes]:
+        for lineno, line in enumerate(self._f, 1):
+            self.bytes += len(line)
+            if line.strip():
+                self.records += 1
+                self._linenos.append(lineno)
+                yield _JSONDocument(line) if self._json_only else line
+
+    def lineno(self) -> int:
+        return self._linenos.popleft()
+
+def _check(ctx: Context, schema: Value, lines: Iterable[bytes], eval_opts: Tuple[EvalOption, ...], chunksize: int) -> Iterator[BatchResult]:
+    for chunk in _chunks(lines, chunksize):
+        # release the records of each chunk promptly.
+        with ctx.arena():
+            res = ctx.validate_batch(schema, chunk, *eval_opts)
+        yield res
+
+if __name__ == "__main__":
+    sys.exit(main())
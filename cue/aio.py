@@ -0,0 +1,228 @@
+# Copyright 2024 The CUE Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# 	http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Use CUE from asyncio.
+
+Compiling, unifying, validating and exporting large values can take
+long enough to stall an event loop. The coroutines in this module run
+them on a bounded thread pool instead; as cffi releases the GIL while
+in libcue, the event loop keeps running meanwhile.
+
+At most max_pending calls are in flight per Executor. Further calls
+wait, without blocking the event loop, until a slot frees up. A call
+cancelled while still queued never runs; a call that already started
+runs to completion, as libcue calls can not be interrupted, but its
+result is discarded.
+"""
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Optional, TypeVar, final
+from cue.build import BuildOption
+from cue.eval import EvalOption
+from cue.value import Value
+import asyncio
+import contextvars
+import os
+import threading
+import time
+import weakref
+
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+    from cue.context import Context
+
+T = TypeVar('T')
+
+@dataclass(frozen=True)
+class ExecutorStats:
+    """
+    Statistics about calls run by an Executor.
+
+    Times are in seconds.
+
+    Args:
+        submitted: calls submitted.
+        completed: calls that ran to completion, successfully or not.
+        failed: completed calls that raised an exception.
+        cancelled: calls cancelled before they started.
+        pending: calls submitted but not yet completed or cancelled.
+        queue_wait: total time calls waited for a thread.
+        queue_wait_max: longest time a call waited for a thread.
+        exec_time: total time spent running calls.
+        exec_time_max: longest time spent running a call.
+    """
+    submitted: int
+    completed: int
+    failed: int
+    cancelled: int
+    pending: int
+    queue_wait: float
+    queue_wait_max: float
+    exec_time: float
+    exec_time_max: float
+
+@final
+class Executor:
+    """
+    A bounded thread pool for running CUE calls from asyncio.
+
+    An Executor must only be used from a single event loop.
+
+    Args:
+        max_workers: number of threads, by default the number of CPUs.
+        max_pending: maximum number of calls submitted to the pool at
+            once, queued or running, by default four per thread.
+    """
+
+    _pool: ThreadPoolExecutor
+    _slots: asyncio.Semaphore
+    _lock: threading.Lock
+
+    def __init__(self, max_workers: Optional[int] = None, max_pending: Optional[int] = None):
+        workers = max_workers or os.cpu_count() or 1
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="cue-aio")
+        self._slots = asyncio.Semaphore(max_pending or 4 * workers)
+        self._lock = threading.Lock()
+        self._submitted = 0
+        self._completed = 0
+        self._failed = 0
+        self._cancelled = 0
+        self._queue_wait = 0.0
+        self._queue_wait_max = 0.0
+        self._exec_time = 0.0
+        self._exec_time_max = 0.0
+
+    async def run(self, fn: Callable[..., T], *args) -> T:
+        """
+        Run fn(*args) on the pool and await its result.
+        """
+        # back-pressure: wait for a free slot before submitting.
+        await self._slots.acquire()
+        loop = asyncio.get_running_loop()
+        # run with the caller's context variables, such as its arena.
+        ctx = contextvars.copy_context()
+        submitted = time.perf_counter()
+
+        def call() -> T:
+            started = time.perf_counter()
+            failed = False
+            try:
+                return ctx.run(fn, *args)
+            except BaseException:
+                failed = True
+                raise
+            finally:
+                self._record(started - submitted, time.perf_counter() - started, failed)
+
+        def done(f: Future[T]):
+            if f.cancelled():
+                with self._lock:
+                    self._cancelled += 1
+            # the slot is held until the call is done, even if the
+            # awaiting task was cancelled while the call was running.
+            if not loop.is_closed():
+                loop.call_soon_threadsafe(self._slots.release)
+
+        try:
+            fut = self._pool.submit(call)
+        except BaseException:
+            self._slots.release()
+            raise
+        with self._lock:
+            self._submitted += 1
+        fut.add_done_callback(done)
+        # cancelling the awaiting task cancels fut if it did not start.
+        return await asyncio.wrap_future(fut)
+
+    def _record(self, wait: float, exec_time: float, failed: bool):
+        with self._lock:
+            self._completed += 1
+            self._failed += failed
+            self._queue_wait += wait
+            self._queue_wait_max = max(self._queue_wait_max, wait)
+            self._exec_time += exec_time
+            self._exec_time_max = max(self._exec_time_max, exec_time)
+
+    def stats(self) -> ExecutorStats:
+        """
+        Return statistics about the calls run so far.
+        """
+        with self._lock:
+            return ExecutorStats(
+                submitted=self._submitted,
+                completed=self._completed,
+                failed=self._failed,
+                cancelled=self._cancelled,
+                pending=self._submitted - self._completed - self._cancelled,
+                queue_wait=self._queue_wait,
+                queue_wait_max=self._queue_wait_max,
+                exec_time=self._exec_time,
+                exec_time_max=self._exec_time_max,
+            )
+
+    def shutdown(self, wait: bool = True):
+        """
+        Shut down the thread pool, cancelling queued calls.
+        """
+        self._pool.shutdown(wait=wait, cancel_futures=True)
+
+# Default executors, one per event loop.
+_defaults: 'weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Executor]' = weakref.WeakKeyDictionary()
+
+def default_executor() -> Executor:
+    """
+    Return the Executor of the running event loop, used when none is
+    passed explicitly.
+    """
+    loop = asyncio.get_running_loop()
+    executor = _defaults.get(loop)
+    if executor is None:
+        executor = Executor()
+        _defaults[loop] = executor
+    return executor
+
+def _executor(executor: Optional[Executor]) -> Executor:
+    return executor if executor is not None else default_executor()
+
+async def compile(ctx: 'Context', s: str | bytes, *opts: BuildOption, executor: Optional[Executor] = None) -> Value:
+    """
+    Compile CUE code. See Context.compile.
+    """
+    return await _executor(executor).run(ctx.compile, s, *opts)
+
+async def unify(x: Value, y: Value, executor: Optional[Executor] = None) -> Value:
+    """
+    Compute the greatest lower bound of two CUE values. See Value.unify.
+    """
+    return await _executor(executor).run(x.unify, y)
+
+async def check_schema(val: Value, schema: Value, *opts: EvalOption, executor: Optional[Executor] = None) -> None:
+    """
+    Ensure a value conforms to a schema. See Value.check_schema.
+    """
+    await _executor(executor).run(val.check_schema, schema, *opts)
+
+async def validate(val: Value, *opts: EvalOption, executor: Optional[Executor] = None) -> None:
+    """
+    Ensure the value does not contain errors. See Value.validate.
+    """
+    await _executor(executor).run(val.validate, *opts)
+
+async def to_json(val: Value, executor: Optional[Executor] = None) -> str:
+    """
+    Marshall CUE value to JSON. See Value.to_json.
+    """
+    return await _executor(executor).run(val.to_json)
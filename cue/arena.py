@@ -0,0 +1,110 @@
+# Copyright 2024 The CUE Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# 	http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Release groups of CUE resources together.
+"""
+
+from contextvars import Token
+from types import TracebackType
+from typing import Dict, Optional, Type, final
+from cue.res import _Resource, _current_arena, _free_all
+
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+    from cue.context import Context
+
+@final
+class Arena:
+    """
+    Scope the lifetime of CUE values.
+
+    Every value of the arena's Context created while the arena is
+    active, in the current thread or asyncio task, is tracked by the
+    arena. When the arena exits, all tracked values are released with
+    a single call into libcue, and using them afterwards raises
+    RuntimeError. Values of other contexts, and errors, are not
+    tracked.
+
+    Values that must outlive the arena can be detached with
+    Value.detach.
+
+    Arenas are created with Context.arena, and can be nested, also
+    across contexts: a value is tracked by the innermost active arena
+    of its Context.
+    """
+
+    _ctx: 'Context'
+    _resources: Dict[int, _Resource]
+    _parent: Optional['Arena']
+    _token: Optional[Token[Optional['Arena']]]
+
+    def __init__(self, ctx: 'Context'):
+        self._ctx = ctx
+        self._resources = {}
+        self._parent = None
+        self._token = None
+
+    def __len__(self) -> int:
+        return len(self._resources)
+
+    def __enter__(self) -> 'Arena':
+        self._parent = _current_arena.get()
+        self._token = _current_arena.set(self)
+        return self
+
+    def __exit__(self,
+                 exc_type: Optional[Type[BaseException]],
+                 exc: Optional[BaseException],
+                 tb: Optional[TracebackType]) -> None:
+        if self._token is not None:
+            _current_arena.reset(self._token)
+            self._token = None
+        self._parent = None
+        self.release()
+
+    def release(self) -> int:
+        """
+        Release all values tracked by the arena.
+
+        Returns:
+            int: the number of handles released.
+        """
+        resources, self._resources = self._resources, {}
+        vals = []
+        for res in resources.values():
+            res._arena = None
+            v = res._take()
+            if v != 0:
+                vals.append(v)
+        return _free_all(vals)
+
+    def _owner(self, res: _Resource) -> Optional['Arena']:
+        """
+        Return the innermost active arena of the Context of res,
+        starting from this one, or None.
+        """
+        ctx = getattr(res, "_ctx", None)
+        if ctx is None:
+            return None
+        a: Optional[Arena] = self
+        while a is not None and a._ctx is not ctx:
+            a = a._parent
+        return a
+
+    def _track(self, res: _Resource):
+        self._resources[id(res)] = res
+
+    def _untrack(self, res: _Resource):
+        self._resources.pop(id(res), None)
@@ -0,0 +1,193 @@
+# Copyright 2024 The CUE Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# 	http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Validate many records against a schema.
+"""
+
+from concurrent.futures import Executor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Iterable, List, Optional, Tuple, final
+from cffi import FFI
+from cue.compile import _compile_bytes
+from cue.encode import encode
+from cue.error import Error
+from cue.eval import EvalOption, encode_eval_opts
+from cue.result import Err, Ok, Result
+from cue.value import Value, _ValidationEntry, _cached_check, _check_message
+import hashlib
+import json
+import libcue
+
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+    from cue.cache import _LRUCache
+    from cue.context import Context
+
+@dataclass
+class BatchResult:
+    """
+    Outcome of validating a sequence of records.
+
+    Args:
+        ok: for each record, in order, True IFF it passed.
+        errors: index and error message of each failed record.
+    """
+    ok: List[bool] = field(default_factory=list)
+    errors: List[Tuple[int, str]] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.ok)
+
+    @property
+    def passed(self) -> int:
+        """The number of records that passed."""
+        return len(self.ok) - len(self.errors)
+
+    @property
+    def failed(self) -> int:
+        """The number of records that failed."""
+        return len(self.errors)
+
+def validate_batch(ctx: 'Context', schema: Value, records: Iterable[Any], *opts: EvalOption) -> BatchResult:
+    # encode options and resolve the schema handle once for the
+    # whole batch.
+    eval_opts = encode_eval_opts(*opts)
+    schema_res = schema._res()
+
+    res = BatchResult()
+    cache = ctx._validation_cache
+    if cache is not None:
+        for i, rec in enumerate(records):
+            msg = _check_record_cached(ctx, cache, schema, rec, opts, eval_opts)
+            res.ok.append(msg is None)
+            if msg is not None:
+                res.errors.append((i, msg))
+        return res
+
+    for i, rec in enumerate(records):
+        try:
+            val = _to_record(ctx, rec)
+        except _RECORD_ERRORS as e:
+            res.ok.append(False)
+            res.errors.append((i, str(e)))
+            continue
+
+        err = libcue.instance_of(val._res(), schema_res, eval_opts)
+        if err != 0:
+            res.ok.append(False)
+            res.errors.append((i, str(Error(err))))
+        else:
+            res.ok.append(True)
+    return res
+
+def map_validate(ctx: 'Context',
+                 records: Iterable[Any],
+                 *opts: EvalOption,
+                 schema: Optional[Value] = None,
+                 max_workers: Optional[int] = None,
+                 chunksize: int = 64,
+                 executor: Optional[Executor] = None) -> List[Result[None, str]]:
+    if chunksize <= 0:
+        raise ValueError("chunksize must be positive")
+
+    # the encoded options are only read by libcue, so all threads
+    # can share them.
+    eval_opts = encode_eval_opts(*opts)
+    recs = list(records)
+    chunks = [recs[i:i + chunksize] for i in range(0, len(recs), chunksize)]
+
+    def check(chunk: List[Any]) -> List[Result[None, str]]:
+        return [_check(ctx, schema, rec, opts, eval_opts) for rec in chunk]
+
+    res: List[Result[None, str]] = []
+    if executor is not None:
+        for part in executor.map(check, chunks):
+            res.extend(part)
+        return res
+    with ThreadPoolExecutor(max_workers=max_workers) as ex:
+        for part in ex.map(check, chunks):
+            res.extend(part)
+    return res
+
+def _check(ctx: 'Context', schema: Optional[Value], rec: Any, opts: Tuple[EvalOption, ...], eval_opts: Optional[FFI.CData]) -> Result[None, str]:
+    cache = ctx._validation_cache
+    if cache is not None:
+        msg = _check_record_cached(ctx, cache, schema, rec, opts, eval_opts)
+    else:
+        msg = _check_record(ctx, schema, rec, eval_opts)
+    return Ok(None) if msg is None else Err(msg)
+
+def _check_record(ctx: 'Context', schema: Optional[Value], rec: Any, eval_opts: Optional[FFI.CData]) -> Optional[str]:
+    try:
+        val = _to_record(ctx, rec)
+    except _RECORD_ERRORS as e:
+        return str(e)
+    return _check_message(val._res(), schema, eval_opts)
+
+def _check_record_cached(ctx: 'Context',
+                         cache: '_LRUCache[_ValidationEntry]',
+                         schema: Optional[Value],
+                         rec: Any,
+                         opts: Tuple[EvalOption, ...],
+                         eval_opts: Optional[FFI.CData]) -> Optional[str]:
+    # JSON documents and Python objects are keyed by their CUE source,
+    # so repeated records are not even compiled.
+    if isinstance(rec, (bytes, bytearray, memoryview)):
+        # the same bytes may fail only as a JSON document.
+        person = b"json" if type(rec) is _JSONDocument else b""
+        data = hashlib.blake2b(rec, digest_size=16, person=person).digest()
+        return _cached_check(cache, schema, opts, data, lambda: _check_record(ctx, schema, rec, eval_opts))
+    if isinstance(rec, (dict, list, tuple)):
+        # as Context.to_value does.
+        try:
+            src = encode(rec)
+        except _RECORD_ERRORS as e:
+            return str(e)
+        data = hashlib.blake2b(src, digest_size=16).digest()
+        return _cached_check(cache, schema, opts, data, lambda: _check_record(ctx, schema, src, eval_opts))
+    if isinstance(rec, Value):
+        return _cached_check(cache, schema, opts, rec, lambda: _check_message(rec._res(), schema, eval_opts))
+    # scalars are built without source to key them by.
+    return _check_record(ctx, schema, rec, eval_opts)
+
+# Errors converting a record, reported as the failure of that record:
+# TypeError and ValueError for Python objects with no CUE equivalent,
+# such as sets or NaN.
+_RECORD_ERRORS = (Error, TypeError, ValueError)
+
+@final
+class _JSONDocument(bytes):
+    """
+    A record that must be a JSON document, not any CUE value.
+
+    libcue compiles any bytes as CUE. Records marked this way are
+    checked to be JSON where they are compiled, which for a
+    ValidationPool is in the worker.
+    """
+
+    __slots__ = ()
+
+def _to_record(ctx: 'Context', rec: Any) -> Value:
+    if isinstance(rec, Value):
+        return rec
+    if isinstance(rec, (bytes, bytearray, memoryview)):
+        if type(rec) is _JSONDocument:
+            try:
+                json.loads(rec)
+            except ValueError as e:
+                raise ValueError(f"invalid JSON: {e}") from None
+        # JSON is valid CUE.
+        return _compile_bytes(ctx, rec)
+    return ctx.to_value(rec)
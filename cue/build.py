@@ -19,13 +19,14 @@ Corresponding Go functionality is documented at:
 https://pkg.go.dev/cuelang.org/go/cue#BuildOption
 """
 
-from typing import Optional, assert_never
+from typing import List, Optional, Tuple, assert_never
 from dataclasses import dataclass
+from functools import lru_cache
 from cffi import FFI
 from cue.value import Value
 import libcue
 
-@dataclass
+@dataclass(frozen=True)
 class FileName:
     """
     Assign a file name to parsed content.
@@ -41,7 +42,7 @@ class FileName:
     """
     name: str
 
-@dataclass
+@dataclass(frozen=True)
 class ImportPath:
     """
     Define the import path used when building CUE.
@@ -57,7 +58,7 @@ class ImportPath:
     """
     path: str
 
-@dataclass
+@dataclass(frozen=True)
 class InferBuiltins:
     """
     Interpret unresolved identifiers as builtins.
@@ -73,7 +74,7 @@ class InferBuiltins:
     """
     infer: bool
 
-@dataclass
+@dataclass(frozen=True)
 class Scope:
     """
     Resolve identifiers in specific scope.
@@ -92,18 +93,37 @@ class Scope:
 BuildOption = FileName | ImportPath | InferBuiltins | Scope
 
 def encode_build_opts(*opts: BuildOption) -> Optional[FFI.CData]:
+    """
+    Encode build options for libcue.
+
+    Options are immutable, so encoded arrays are cached by option
+    tuple and shared between callers, which must not modify them.
+    Options holding a Scope are encoded afresh each time, as they
+    refer to a value handle.
+    """
     if len(opts) == 0:
         return None
+    if any(isinstance(opt, Scope) for opt in opts):
+        return _encode_build_opts.__wrapped__(opts)
+    return _encode_build_opts(opts)
+
+@lru_cache(maxsize=256)
+def _encode_build_opts(opts: Tuple[BuildOption, ...]) -> FFI.CData:
+    # a[i].str does not own the string it points to, so strings are
+    # collected here and kept alive for as long as the array.
+    strs: List[FFI.CData] = []
 
     a = _alloc_bopt_array(len(opts))
     for i, opt in enumerate(opts):
         match opt:
             case FileName(name):
                 c_str = libcue.ffi.new("char[]", name.encode("utf-8"))
+                strs.append(c_str)
                 a[i].tag = libcue.BUILD_FILENAME
                 a[i].str = c_str
             case ImportPath(path):
                 c_str = libcue.ffi.new("char[]", path.encode("utf-8"))
+                strs.append(c_str)
                 a[i].tag = libcue.BUILD_IMPORT_PATH
                 a[i].str = c_str
             case InferBuiltins(b):
@@ -111,12 +131,16 @@ def encode_build_opts(*opts: BuildOption) -> Optional[FFI.CData]:
                 a[i].b = b
             case Scope(scope):
                 a[i].tag = libcue.BUILD_SCOPE
-                a[i].value = scope._val
+                a[i].value = scope._res()
             case _:
                 # use `assert_never` on `_` to enable
                 # exhaustiveness matching.
                 assert_never(opt)
-    return a
+
+    if len(strs) == 0:
+        return a
+    # the returned cdata keeps a alive, and its destructor keeps strs.
+    return libcue.ffi.gc(a, lambda _: strs.clear())
 
 
 def _alloc_bopt_array(num: int) -> FFI.CData:
@@ -0,0 +1,126 @@
+# Copyright 2024 The CUE Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# 	http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Bounded caches used by Context.
+"""
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Generic, Hashable, Optional, Tuple, TypeVar, final
+import threading
+import time
+
+V = TypeVar('V')
+
+@dataclass(frozen=True)
+class CacheInfo:
+    """
+    Statistics about a cache.
+
+    Args:
+        hits: number of lookups that found an entry.
+        misses: number of lookups that did not find an entry.
+        evictions: number of entries dropped to respect maxsize.
+        size: current number of entries.
+        maxsize: maximum number of entries.
+        expirations: number of entries dropped because they outlived
+            the time to live of the cache.
+    """
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+    maxsize: int
+    expirations: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """
+        The fraction of lookups that found an entry.
+        """
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+@final
+class _LRUCache(Generic[V]):
+    """
+    A size-bounded, least-recently-used cache.
+
+    With a ttl, entries also expire that many seconds after they were
+    put, and are dropped when next looked up.
+    """
+
+    _entries: 'OrderedDict[Hashable, Tuple[float, V]]'
+    _maxsize: int
+    _ttl: Optional[float]
+    _hits: int
+    _misses: int
+    _evictions: int
+    _expirations: int
+    _lock: threading.Lock
+
+    def __init__(self, maxsize: int, ttl: Optional[float] = None):
+        if maxsize <= 0:
+            raise ValueError("cache size must be positive")
+        if ttl is not None and ttl <= 0:
+            raise ValueError("cache ttl must be positive")
+        self._entries = OrderedDict()
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[V]:
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                self._misses += 1
+                return None
+            expires, entry = item
+            if self._ttl is not None and time.monotonic() >= expires:
+                del self._entries[key]
+                self._expirations += 1
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry
+
+    def put(self, key: Hashable, entry: V) -> None:
+        expires = time.monotonic() + self._ttl if self._ttl is not None else 0.0
+        with self._lock:
+            self._entries[key] = (expires, entry)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def info(self) -> CacheInfo:
+        with self._lock:
+            return CacheInfo(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                size=len(self._entries),
+                maxsize=self._maxsize,
+                expirations=self._expirations,
+            )
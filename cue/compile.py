@@ -16,9 +16,23 @@
 Compile CUE code.
 """
 
-from cue.build import BuildOption, encode_build_opts
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from typing import Callable, Dict, Hashable, Iterable, List, Optional, Tuple, assert_never
+from cue.build import (
+    BuildOption,
+    FileName,
+    ImportPath,
+    InferBuiltins,
+    Scope,
+    encode_build_opts,
+)
 from cue.value import Value
 from cue.error import Error
+from cue import trace
+import contextvars
+import hashlib
+import mmap
+import os
 import libcue
 
 from typing import TYPE_CHECKING
@@ -26,8 +40,57 @@ if TYPE_CHECKING:
     from cue.context import Context
 
 def compile(ctx: 'Context', s: str, *opts: BuildOption) -> Value:
+    src = s.encode("utf-8")
+    build = lambda: _cached(ctx, src, opts, lambda: _compile_string(ctx, src, *opts))
+    tracer = trace._tracer
+    if tracer is None:
+        return build()
+    return _traced(tracer, src, opts, build)
+
+def compile_bytes(ctx: 'Context', buf: bytes | mmap.mmap, *opts: BuildOption) -> Value:
+    build = lambda: _cached(ctx, buf, opts, lambda: _compile_bytes(ctx, buf, *opts))
+    tracer = trace._tracer
+    if tracer is None:
+        return build()
+    return _traced(tracer, buf, opts, build)
+
+def compile_file(ctx: 'Context', path: str | os.PathLike[str], *opts: BuildOption) -> Value:
+    name = os.fspath(path)
+    if not any(isinstance(opt, FileName) for opt in opts):
+        opts = (FileName(name),) + opts
+
+    with open(name, "rb") as f:
+        # empty files can not be mapped.
+        if os.fstat(f.fileno()).st_size == 0:
+            return compile_bytes(ctx, b"", *opts)
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+            return compile_bytes(ctx, m, *opts)
+
+def compile_files(ctx: 'Context',
+                  paths: Iterable[str | os.PathLike[str]],
+                  *opts: BuildOption,
+                  max_workers: Optional[int] = None,
+                  executor: Optional[Executor] = None) -> List[Value]:
+    def submit(ex: Executor, path: str | os.PathLike[str]) -> Future[Value]:
+        # compile with the caller's context variables, such as its
+        # arena; each call needs a copy of its own.
+        return ex.submit(contextvars.copy_context().run, compile_file, ctx, path, *opts)
+
+    if executor is not None:
+        return [f.result() for f in [submit(executor, p) for p in paths]]
+    with ThreadPoolExecutor(max_workers=max_workers) as ex:
+        return [f.result() for f in [submit(ex, p) for p in paths]]
+
+def _traced(tracer: trace.Tracer, src: bytes | mmap.mmap, opts: Tuple[BuildOption, ...], build: Callable[[], Value]) -> Value:
+    attributes: Dict[str, trace.AttributeValue] = {
+        "cue.source.size": len(src),
+        "cue.options": trace._options(opts),
+    }
+    return trace._run(tracer, "cue.compile", attributes, build)
+
+def _compile_string(ctx: 'Context', src: bytes, *opts: BuildOption) -> Value:
     val_ptr = libcue.ffi.new("cue_value*")
-    buf = libcue.ffi.new("char[]", s.encode("utf-8"))
+    buf = libcue.ffi.new("char[]", src)
 
     build_opts = encode_build_opts(*opts)
     err = libcue.compile_string(ctx._res(), buf, build_opts, val_ptr)
@@ -35,12 +98,49 @@ def compile(ctx: 'Context', s: str, *opts: BuildOption) -> Value:
         raise Error(err)
     return Value(ctx, val_ptr[0])
 
-def compile_bytes(ctx: 'Context', buf: bytes, *opts: BuildOption) -> Value:
+def _compile_bytes(ctx: 'Context', buf: bytes | mmap.mmap, *opts: BuildOption) -> Value:
     val_ptr = libcue.ffi.new("cue_value*")
-    buf_ptr = libcue.ffi.from_buffer(buf)
 
     build_opts = encode_build_opts(*opts)
-    err = libcue.compile_bytes(ctx._res(), buf_ptr, len(buf), build_opts, val_ptr)
+    # release the buffer before returning, so that a mapped file can
+    # be closed even while an Error from here is being handled.
+    with libcue.ffi.from_buffer(buf) as buf_ptr:
+        err = libcue.compile_bytes(ctx._res(), buf_ptr, len(buf), build_opts, val_ptr)
     if err != 0:
         raise Error(err)
     return Value(ctx, val_ptr[0])
+
+def _cached(ctx: 'Context', src: bytes | mmap.mmap, opts: Tuple[BuildOption, ...], build: Callable[[], Value]) -> Value:
+    cache = ctx._compile_cache
+    if cache is None:
+        return build()
+
+    key = (hashlib.blake2b(src, digest_size=16).digest(), _opts_key(opts))
+    entry = cache.get(key)
+    if entry is not None:
+        return entry[0]
+
+    # cached values must survive the arena they were compiled in.
+    val = build().detach()
+    # keep the options alive alongside the value, so that a Scope
+    # handle used in the key can not be reused by another value.
+    cache.put(key, (val, opts))
+    return val
+
+def _opts_key(opts: Tuple[BuildOption, ...]) -> Hashable:
+    key: List[Tuple[int, Hashable]] = []
+    for opt in opts:
+        match opt:
+            case FileName(name):
+                key.append((libcue.BUILD_FILENAME, name))
+            case ImportPath(path):
+                key.append((libcue.BUILD_IMPORT_PATH, path))
+            case InferBuiltins(b):
+                key.append((libcue.BUILD_INFER_BUILTINS, bool(b)))
+            case Scope(scope):
+                key.append((libcue.BUILD_SCOPE, scope._res()))
+            case _:
+                # use `assert_never` on `_` to enable
+                # exhaustiveness matching.
+                assert_never(opt)
+    return tuple(key)
@@ -14,16 +14,43 @@
 
 """
 Create CUE values.
+
+Thread safety: a Context and the Values created from it may be shared
+between threads. Releasing their handles, whether through close,
+arenas or garbage collection, is thread-safe, and so are the compile
+and release caches. cffi releases the GIL for the duration of every
+call into libcue, so CUE evaluation on different threads runs in
+parallel; see Context.map_validate. Explicitly closing a Value while
+another thread is still using it is an error.
 """
 
+from concurrent.futures import Executor
 from functools import singledispatchmethod
-from typing import final
-from cue.value import Value
+from typing import Any, Iterable, List, Optional, Tuple, final
+from cue.arena import Arena
+from cue.batch import BatchResult, map_validate, validate_batch
+from cue.value import Value, _ValidationEntry
 from cue.build import BuildOption
-from cue.compile import compile, compile_bytes
-from cue.res import _Resource
+from cue.cache import CacheInfo, _LRUCache
+from cue.compile import compile, compile_bytes, compile_file, compile_files, _compile_bytes
+from cue.encode import encode
+from cue.eval import EvalOption
+from cue.path import Path
+from cue.res import _Resource, _release_queue
+from cue.result import Result
+import os
 import libcue
 
+@final
+class _ContextResource(_Resource):
+    """
+    The handle of a Context.
+    """
+
+    __slots__ = ()
+
+    _kind = "context"
+
 @final
 class Context:
     """
@@ -34,12 +61,40 @@ class Context:
 
     Corresponding Go functionality is documented at:
     https://pkg.go.dev/cuelang.org/go/cue#Context
+
+    Args:
+        compile_cache_size: if positive, cache up to this many
+            compiled values, keyed by source and build options.
+        validation_cache_size: if positive, cache the outcome of up
+            to this many checks by Value.check_schema, Value.validate,
+            validate_batch and map_validate, keyed by schema, options
+            and the data: a digest of the bytes of JSON documents and
+            of the CUE encoding of Python objects, or the identity of
+            Values, as no export of a value keeps everything a check
+            depends on. Values from a compile cache are the same
+            Value for the same source. Only a replayed failure raises
+            an Error that holds just its message.
+        validation_cache_ttl: if given, cached outcomes expire after
+            this many seconds.
     """
 
-    _ctx: _Resource
+    _ctx: '_ContextResource'
+    _compile_cache: Optional[_LRUCache[Tuple[Value, Tuple[BuildOption, ...]]]]
+    _validation_cache: Optional[_LRUCache[_ValidationEntry]]
 
-    def __init__(self):
-        self._ctx = _Resource(libcue.newctx())
+    def __init__(self,
+                 compile_cache_size: int = 0,
+                 validation_cache_size: int = 0,
+                 validation_cache_ttl: Optional[float] = None):
+        self._ctx = _ContextResource(libcue.newctx())
+        # a context is never an intermediate value.
+        self._ctx.detach()
+        self._compile_cache = None
+        if compile_cache_size > 0:
+            self._compile_cache = _LRUCache(compile_cache_size)
+        self._validation_cache = None
+        if validation_cache_size > 0:
+            self._validation_cache = _LRUCache(validation_cache_size, validation_cache_ttl)
 
     def _res(self) -> int:
         return self._ctx.res()
@@ -73,6 +128,135 @@ class Context:
     def _(self, b: bytes, *opts: BuildOption) -> Value:
         return compile_bytes(self, b, *opts)
 
+    def compile_file(self, path: str | os.PathLike[str], *opts: BuildOption) -> Value:
+        """
+        Compile a file of CUE code, or of JSON.
+
+        The file is memory-mapped and passed to libcue as is, so it is
+        never read into a Python bytes object.
+
+        Args:
+            path: the file to compile.
+            *opts: build options to use. Unless a FileName is given,
+                the path is used so that errors show positions in the
+                file.
+
+        Returns:
+            Value: the CUE value corresponding to the file.
+
+        Raises:
+            Error: if the file does not compile.
+            OSError: if the file can not be read.
+        """
+        return compile_file(self, path, *opts)
+
+    def compile_files(self,
+                      paths: Iterable[str | os.PathLike[str]],
+                      *opts: BuildOption,
+                      max_workers: Optional[int] = None,
+                      executor: Optional[Executor] = None) -> List[Value]:
+        """
+        Compile many files concurrently with compile_file.
+
+        Args:
+            paths: the files to compile.
+            *opts: build options to use for every file.
+            max_workers: number of threads, when executor is not given.
+            executor: run on this executor instead of a new thread pool.
+
+        Returns:
+            List[Value]: the value of each file, in the order of paths.
+
+        Raises:
+            Error: the error of the first file, in order, that does
+                not compile.
+            OSError: if a file can not be read.
+        """
+        return compile_files(self, paths, *opts, max_workers=max_workers, executor=executor)
+
+    def compile_cache_info(self) -> Optional[CacheInfo]:
+        """
+        Report compile cache statistics.
+
+        Returns:
+            Optional[CacheInfo]: hit, miss and eviction counters, or
+            None if the compile cache is disabled.
+        """
+        if self._compile_cache is None:
+            return None
+        return self._compile_cache.info()
+
+    def compile_cache_clear(self) -> None:
+        """
+        Drop all entries from the compile cache.
+        """
+        if self._compile_cache is not None:
+            self._compile_cache.clear()
+
+    def validation_cache_info(self) -> Optional[CacheInfo]:
+        """
+        Report validation cache statistics.
+
+        Returns:
+            Optional[CacheInfo]: hit, miss, eviction and expiration
+            counters, or None if the validation cache is disabled.
+        """
+        if self._validation_cache is None:
+            return None
+        return self._validation_cache.info()
+
+    def validation_cache_clear(self) -> None:
+        """
+        Drop all entries from the validation cache.
+        """
+        if self._validation_cache is not None:
+            self._validation_cache.clear()
+
+    def arena(self) -> Arena:
+        """
+        Scope the lifetime of values created in a block.
+
+        Use as `with ctx.arena():`. All values of this Context created
+        inside the block are released together when the block exits,
+        except those detached with Value.detach. Values of other
+        contexts are not affected.
+
+        Returns:
+            Arena: the arena, to be used as a context manager.
+        """
+        return Arena(self)
+
+    def flush(self) -> int:
+        """
+        Release garbage collected resources.
+
+        Handles of garbage collected values are released in batches
+        once enough of them accumulate, and at interpreter exit.
+        Calling flush releases all of them right away.
+
+        Returns:
+            int: the number of handles released.
+        """
+        return _release_queue.flush()
+
+    def pending_releases(self) -> int:
+        """
+        Return the number of handles waiting to be released.
+        """
+        return len(_release_queue)
+
+    def path(self, path: str) -> Path:
+        """
+        Precompile a CUE path for use with Value.lookup.
+
+        Args:
+            path: CUE path, such as "a.b.c".
+
+        Returns:
+            Path: the encoded path.
+        """
+        return Path(path)
+
     def top(self) -> Value:
         """
         Return an instance of CUE `_`.
@@ -90,11 +274,19 @@ class Context:
         """
         Convert Python value to CUE value.
 
+        dicts, lists and tuples are converted as a whole: the tree is
+        encoded in one pass and built with a single call into libcue.
+
         Args:
-            arg: a Python bool, int, float, str, or bytes.
+            arg: a Python bool, int, float, str, bytes, None, or a
+                dict, list or tuple of those.
 
         Returns:
             Value: the CUE value denoting arg.
+
+        Raises:
+            TypeError: if arg holds a value that has no CUE equivalent.
+            ValueError: if arg holds a NaN or infinite float.
         """
         raise NotImplementedError
 
@@ -120,6 +312,72 @@ class Context:
         c_buf = libcue.ffi.from_buffer(arg)
         return Value(self, libcue.from_bytes(self._res(), c_buf, len(arg)))
 
+    @to_value.register(type(None))
+    def _(self, arg: None):
+        return _compile_bytes(self, b"null")
+
+    @to_value.register(dict)
+    @to_value.register(list)
+    @to_value.register(tuple)
+    def _(self, arg):
+        return _compile_bytes(self, encode(arg))
+
+    def validate_batch(self, schema: Value, records: Iterable[Any], *opts: EvalOption) -> BatchResult:
+        """
+        Check many records against a schema.
+
+        Like calling Value.check_schema for each record, but evaluation
+        options are encoded once for the whole batch and failures are
+        collected instead of raised, including records that can not be
+        converted to CUE, such as a set or a NaN float.
+
+        Args:
+            schema: CUE schema to check against.
+            records: Values, JSON documents as bytes, or Python objects
+                accepted by to_value.
+            *opts: evaluation options.
+
+        Returns:
+            BatchResult: which records passed, and the errors of those
+            that did not.
+        """
+        return validate_batch(self, schema, records, *opts)
+
+    def map_validate(self,
+                     records: Iterable[Any],
+                     *opts: EvalOption,
+                     schema: Optional[Value] = None,
+                     max_workers: Optional[int] = None,
+                     chunksize: int = 64,
+                     executor: Optional[Executor] = None) -> List[Result[None, str]]:
+        """
+        Validate records concurrently on a thread pool.
+
+        Records are split into chunks of chunksize, and each chunk is
+        checked on a worker thread. Since the GIL is released while
+        libcue evaluates, this uses several cores at once.
+
+        Args:
+            records: Values, JSON documents as bytes, or Python objects
+                accepted by to_value.
+            *opts: evaluation options.
+            schema: if set, check records against it as with
+                Value.check_schema, otherwise validate them as with
+                Value.validate.
+            max_workers: number of threads of the pool created for
+                this call.
+            chunksize: number of records per task.
+            executor: run on this executor instead of creating a
+                pool.
+
+        Returns:
+            List[Result[None, str]]: for each record, in order, Ok if
+            it is valid, or the CUE error as a string.
+        """
+        return map_validate(self, records, *opts, schema=schema,
+                            max_workers=max_workers, chunksize=chunksize,
+                            executor=executor)
+
     def to_value_from_unsigned(self, arg: int) -> Value:
         """
         Convert Python int to unsigned CUE value.
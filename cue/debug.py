@@ -0,0 +1,162 @@
+# Copyright 2024 The CUE Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# 	http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Inspect handles into libcue.
+
+Every Context, Value and Error owns a handle to a Go-side object,
+which stays alive until the owner is closed, garbage collected or
+released with its arena. Handles piling up, for example because
+values are retained in a long-lived container, show in handles:
+
+    >>> cue.debug.handles()["value"]
+    HandleStats(live=3, peak=1024, created=50000)
+
+To find where leaked handles come from, capture allocation sites and
+list the handles still live:
+
+    cue.debug.track_allocations(True)
+    ...
+    for leak in cue.debug.leaks():
+        print(leak)
+
+Tests can use no_leaks, or the cue_leak_check fixture from the
+cue.testing pytest plugin, to fail when handles created during a test
+outlive it.
+"""
+
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Dict, Iterator, List
+from cue.res import _lock, _registry
+import gc
+import traceback
+
+@dataclass(frozen=True)
+class HandleStats:
+    """
+    Statistics about the handles of one kind.
+
+    Args:
+        live: handles currently owned.
+        peak: highest number of handles owned at once.
+        created: handles created in total.
+    """
+    live: int
+    peak: int
+    created: int
+
+@dataclass(frozen=True)
+class Leak:
+    """
+    A live handle, and where it was allocated.
+
+    Args:
+        kind: kind of handle: context, value or error.
+        handle: the handle.
+        site: innermost frames outside of cue that allocated it.
+    """
+    kind: str
+    handle: int
+    site: traceback.StackSummary
+
+    def __str__(self) -> str:
+        return f"{self.kind} handle {self.handle:#x} allocated at:\n" + "".join(self.site.format())
+
+def handles() -> Dict[str, HandleStats]:
+    """
+    Return statistics about handles, by kind.
+    """
+    with _lock:
+        return {
+            kind: HandleStats(
+                live=_registry.live[kind],
+                peak=_registry.peak[kind],
+                created=_registry.created[kind],
+            )
+            for kind in _registry.live
+        }
+
+def reset_peaks():
+    """
+    Reset the high-water marks to the current number of live handles.
+    """
+    with _lock:
+        _registry.peak.update(_registry.live)
+
+def track_allocations(enabled: bool, depth: int = 8):
+    """
+    Start or stop capturing where handles are allocated.
+
+    Capturing walks the stack on every allocation, so it is meant for
+    debugging. Stopping forgets the sites captured so far.
+
+    Args:
+        enabled: whether to capture allocation sites.
+        depth: number of frames to capture per site.
+    """
+    with _lock:
+        if not enabled:
+            _registry.sites = None
+            return
+        if _registry.sites is None:
+            _registry.sites = {}
+        _registry.depth = depth
+
+def tracking_allocations() -> bool:
+    """
+    Report whether allocation sites are being captured.
+    """
+    return _registry.sites is not None
+
+def leaks(collect: bool = True) -> List[Leak]:
+    """
+    Return the live handles allocated while capturing sites.
+
+    Handles allocated while not capturing are not reported.
+
+    Args:
+        collect: run the garbage collector first, so that handles
+            only reachable from garbage are not reported.
+
+    Returns:
+        List[Leak]: the live handles, oldest first.
+    """
+    if collect:
+        gc.collect()
+    with _lock:
+        sites = dict(_registry.sites or {})
+    return [Leak(kind, handle, site) for handle, (kind, site) in sites.items()]
+
+@contextmanager
+def no_leaks(depth: int = 8) -> Iterator[None]:
+    """
+    Check that no handle allocated within a with block outlives it.
+
+    Raises:
+        AssertionError: listing the leaked handles and their
+            allocation sites.
+    """
+    was_tracking = tracking_allocations()
+    track_allocations(True, depth)
+    before = {leak.handle for leak in leaks(collect=False)}
+    try:
+        yield
+        leaked = [leak for leak in leaks() if leak.handle not in before]
+    finally:
+        if not was_tracking:
+            track_allocations(False)
+    if leaked:
+        report = "\n".join(str(leak) for leak in leaked)
+        raise AssertionError(f"{len(leaked)} CUE handles leaked:\n{report}")
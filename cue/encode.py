@@ -0,0 +1,127 @@
+# Copyright 2024 The CUE Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# 	http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Encode Python objects as CUE source.
+"""
+
+from collections import OrderedDict, defaultdict
+from itertools import compress
+from typing import Any, Dict, List
+import json
+
+class _NeedsCUE(Exception):
+    """
+    Raised while encoding JSON when the object has no JSON encoding.
+    """
+    pass
+
+def _json_default(obj: Any) -> Any:
+    if isinstance(obj, (bytes, bytearray)):
+        raise _NeedsCUE
+    raise TypeError(f"Object of type {type(obj).__name__} can not be converted to CUE")
+
+def encode(obj: Any) -> bytes:
+    """
+    Encode a tree of Python objects as CUE source.
+
+    dicts become structs, lists and tuples become lists, None becomes
+    null, and bool, int, float, str and bytes become the corresponding
+    scalars.
+
+    dict keys that are not str are converted as the json module does,
+    so 1 becomes "1".
+
+    Raises:
+        TypeError: if obj holds a value that has no CUE equivalent, or
+            a dict with two keys that convert to the same field name,
+            such as 1 and "1".
+        ValueError: if obj holds a NaN or infinite float.
+    """
+    _check_keys(obj)
+    try:
+        # JSON is valid CUE, and the json module encodes whole trees
+        # in C. Only bytes need CUE specific syntax.
+        s = json.dumps(obj, ensure_ascii=False, allow_nan=False,
+                       separators=(",", ":"), default=_json_default)
+    except _NeedsCUE:
+        out: List[str] = []
+        _encode(obj, out)
+        s = "".join(out)
+    return s.encode("utf-8")
+
+def _encode(obj: Any, out: List[str]):
+    if isinstance(obj, (bytes, bytearray)):
+        out.append(_bytes_literal(obj))
+    elif isinstance(obj, dict):
+        out.append("{")
+        for i, (k, v) in enumerate(obj.items()):
+            if i > 0:
+                out.append(",")
+            out.append(json.dumps(_key(k), ensure_ascii=False))
+            out.append(":")
+            _encode(v, out)
+        out.append("}")
+    elif isinstance(obj, (list, tuple)):
+        out.append("[")
+        for i, v in enumerate(obj):
+            if i > 0:
+                out.append(",")
+            _encode(v, out)
+        out.append("]")
+    else:
+        out.append(json.dumps(obj, ensure_ascii=False, allow_nan=False,
+                              default=_json_default))
+
+# Container types searched for dicts by _check_keys. Filtering by
+# exact type keeps the search in C; subclasses are rare.
+_is_container = {dict, list, tuple, OrderedDict, defaultdict}.__contains__
+_STR = {str}
+
+def _check_keys(obj: Any):
+    # converted keys that collide would become duplicate fields, which
+    # CUE unifies silently. Only dicts with non-str keys need a look.
+    stack = [obj]
+    while stack:
+        o = stack.pop()
+        if isinstance(o, dict):
+            if o and set(map(type, o)) != _STR:
+                _check_dict_keys(o)
+            o = o.values()
+        stack.extend(compress(o, map(_is_container, map(type, o))))
+
+def _check_dict_keys(d: Dict[Any, Any]):
+    seen: Dict[str, Any] = {}
+    for k in d:
+        key = _key(k)
+        if key in seen:
+            raise TypeError(f"keys {seen[key]!r} and {k!r} both convert to field {key!r}")
+        seen[key] = k
+
+def _key(k: Any) -> str:
+    # same conversions as the json module.
+    if isinstance(k, str):
+        return k
+    if k is None or isinstance(k, (bool, int, float)):
+        return json.dumps(k)
+    raise TypeError(f"keys must be str, int, float, bool or None, not {type(k).__name__}")
+
+def _bytes_literal(b: bytes | bytearray) -> str:
+    chars = []
+    for c in b:
+        if 0x20 <= c < 0x7f and c != ord("'") and c != ord("\\"):
+            chars.append(chr(c))
+        else:
+            chars.append(f"\\x{c:02x}")
+    return "'" + "".join(chars) + "'"
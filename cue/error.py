@@ -16,25 +16,48 @@
 Handle CUE errors.
 """
 
-from typing import final
+from typing import Optional, final
 from cue.res import _Resource
 import libcue
 
+@final
+class _ErrorResource(_Resource):
+    """
+    The handle of an Error.
+    """
+
+    __slots__ = ()
+
+    _kind = "error"
+
 @final
 class Error(Exception):
     """
     CUE evaluation error.
+
+    An Error owns a handle to the error in libcue, or, when replayed
+    from a cache, only holds its message.
     """
 
-    _err: _Resource
+    _err: Optional[_ErrorResource]
+    _msg: Optional[str]
 
     def _res(self):
+        if self._err is None:
+            raise RuntimeError("Fatal: error has no handle.")
         return self._err.res()
 
-    def __init__(self, err: int):
-        self._err = _Resource(err)
+    def __init__(self, err: int | str):
+        if isinstance(err, str):
+            self._err = None
+            self._msg = err
+        else:
+            self._err = _ErrorResource(err)
+            self._msg = None
 
     def __str__(self):
+        if self._msg is not None:
+            return self._msg
         c_str = libcue.error_string(self._res())
         s = libcue.ffi.string(c_str).decode("utf-8")
         libcue.libc_free(c_str)
@@ -19,12 +19,13 @@ Corresponding Go functionality is documented at:
 https://pkg.go.dev/cuelang.org/go/cue#Option
 """
 
-from typing import Optional, assert_never
+from typing import Optional, Tuple, assert_never
 from dataclasses import dataclass
+from functools import lru_cache
 from cffi import FFI
 import libcue
 
-@dataclass
+@dataclass(frozen=True)
 class All:
     """
     Indicate that all fields and values should be included in
@@ -35,7 +36,7 @@ class All:
     """
     pass
 
-@dataclass
+@dataclass(frozen=True)
 class Attributes:
     """
     Indicate whether attributes should be included.
@@ -48,7 +49,7 @@ class Attributes:
     """
     attrs: bool
 
-@dataclass
+@dataclass(frozen=True)
 class Concrete:
     """
     Indicate whether non-concrete values are interpreted as errors.
@@ -61,7 +62,7 @@ class Concrete:
     """
     concrete: bool
 
-@dataclass
+@dataclass(frozen=True)
 class Definitions:
     """
     Indicate whether definitions should be included.
@@ -74,7 +75,7 @@ class Definitions:
     """
     defs: bool
 
-@dataclass
+@dataclass(frozen=True)
 class DisallowCycles:
     """
     Force validation in the presence of cycles.
@@ -89,7 +90,7 @@ class DisallowCycles:
     """
     disallow_cycles: bool
 
-@dataclass
+@dataclass(frozen=True)
 class Docs:
     """
     Indicate whether docs should be included.
@@ -102,7 +103,7 @@ class Docs:
     """
     docs: bool
 
-@dataclass
+@dataclass(frozen=True)
 class ErrorsAsValues:
     """
     Treat errors as regular values.
@@ -120,7 +121,7 @@ class ErrorsAsValues:
     """
     err_as_val: bool
 
-@dataclass
+@dataclass(frozen=True)
 class Final:
     """
     Indicate a value is final.
@@ -132,7 +133,7 @@ class Final:
     """
     pass
 
-@dataclass
+@dataclass(frozen=True)
 class Hidden:
     """
     Indicate whether definitions and hidden fields should be included.
@@ -145,7 +146,7 @@ class Hidden:
     """
     hidden: bool
 
-@dataclass
+@dataclass(frozen=True)
 class InlineImports:
     """
     Inline imported references.
@@ -161,7 +162,7 @@ class InlineImports:
     """
     inline_imports: bool
 
-@dataclass
+@dataclass(frozen=True)
 class Optionals:
     """
     Indicate whether optional fields should be included.
@@ -174,7 +175,7 @@ class Optionals:
     """
     optionals: bool
 
-@dataclass
+@dataclass(frozen=True)
 class Raw:
     """
     Generate value without simplification.
@@ -184,7 +185,7 @@ class Raw:
     """
     pass
 
-@dataclass
+@dataclass(frozen=True)
 class Schema:
     """
     Specify input to be a schema.
@@ -203,9 +204,18 @@ def _alloc_eopt_array(num: int) -> FFI.CData:
     return opts
 
 def encode_eval_opts(*opts: EvalOption) -> Optional[FFI.CData]:
+    """
+    Encode evaluation options for libcue.
+
+    Options are immutable, so encoded arrays are cached by option
+    tuple and shared between callers, which must not modify them.
+    """
     if len(opts) == 0:
         return None
+    return _encode_eval_opts(opts)
 
+@lru_cache(maxsize=256)
+def _encode_eval_opts(opts: Tuple[EvalOption, ...]) -> FFI.CData:
     a = _alloc_eopt_array(len(opts))
     for i, opt in enumerate(opts):
         match opt:
@@ -0,0 +1,185 @@
+# Copyright 2024 The CUE Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# 	http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Validate records on a pool of worker processes.
+
+CUE handles are local to a process, so a Context can not be shared
+between processes. Instead, each worker builds its own Context and
+compiles the schema once from source, and records are sent to the
+workers in chunks.
+
+Workers are started with the "spawn" method: the Go runtime inside
+libcue does not survive fork. As with any spawn-based pool, scripts
+using ValidationPool must guard their entry point with
+`if __name__ == "__main__":`.
+"""
+
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from types import TracebackType
+from typing import Any, Deque, Iterable, Iterator, List, Optional, Sequence, Tuple, Type, final
+from cue.batch import BatchResult
+from cue.build import BuildOption
+from cue.context import Context
+from cue.eval import EvalOption
+from cue.result import Err, Ok, Result
+from cue.value import Value
+import multiprocessing
+import os
+
+# Per-process state of a worker, set up by _init_worker.
+_schema: Optional[Value] = None
+_eval_opts: Tuple[EvalOption, ...] = ()
+
+def _init_worker(source: str | bytes, build_opts: Tuple[BuildOption, ...], eval_opts: Tuple[EvalOption, ...]):
+    global _schema, _eval_opts
+    _schema = Context().compile(source, *build_opts)
+    _eval_opts = eval_opts
+
+def _check_chunk(chunk: List[Any]) -> BatchResult:
+    assert _schema is not None
+    return _schema.check_many(chunk, *_eval_opts)
+
+@final
+class ValidationPool:
+    """
+    Validate records against a schema on several processes.
+
+    Args:
+        schema: CUE source of the schema, as str or bytes.
+        *opts: build options used to compile the schema. They are
+            sent to the workers, so Scope is not supported.
+        eval_opts: evaluation options used to check each record.
+        workers: number of worker processes, by default the number
+            of CPUs.
+        chunksize: number of records sent to a worker at once.
+        max_pending: maximum number of chunks in flight, by default
+            twice the number of workers. Bounds memory use when
+            streaming large inputs.
+
+    Raises:
+        Error: if the schema does not compile.
+
+    Records can be JSON documents as bytes or Python objects accepted
+    by Context.to_value; Values can not cross process boundaries.
+    """
+
+    _executor: ProcessPoolExecutor
+    _workers: int
+    _chunksize: int
+    _max_pending: int
+
+    def __init__(self,
+                 schema: str | bytes,
+                 *opts: BuildOption,
+                 eval_opts: Sequence[EvalOption] = (),
+                 workers: Optional[int] = None,
+                 chunksize: int = 256,
+                 max_pending: Optional[int] = None):
+        if chunksize <= 0:
+            raise ValueError("chunksize must be positive")
+        # report errors in the schema here, rather than as a broken
+        # pool on first use.
+        Context().compile(schema, *opts)
+
+        self._workers = workers or os.cpu_count() or 1
+        self._chunksize = chunksize
+        self._max_pending = max_pending or 2 * self._workers
+        self._executor = ProcessPoolExecutor(
+            max_workers=self._workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(schema, tuple(opts), tuple(eval_opts)),
+        )
+
+    @property
+    def workers(self) -> int:
+        """The number of worker processes."""
+        return self._workers
+
+    def validate(self, records: Iterable[Any]) -> Iterator[Result[None, str]]:
+        """
+        Check records against the schema.
+
+        Records are consumed lazily, and results are produced in the
+        same order as the records, as soon as they are available.
+
+        Args:
+            records: records to check.
+
+        Returns:
+            Iterator[Result[None, str]]: for each record, Ok if it
+            conforms to the schema, or the CUE error as a string.
+        """
+        for chunk in self.validate_chunks(records):
+            failed = dict(chunk.errors)
+            for i in range(len(chunk)):
+                msg = failed.get(i)
+                yield Ok(None) if msg is None else Err(msg)
+
+    def validate_chunks(self, records: Iterable[Any]) -> Iterator[BatchResult]:
+        """
+        Check records against the schema, one chunk at a time.
+
+        Like validate, but yields a BatchResult per chunk of at most
+        chunksize records. Error indices are relative to the chunk.
+        """
+        pending: Deque[Future[BatchResult]] = deque()
+        for chunk in _chunks(records, self._chunksize):
+            pending.append(self._executor.submit(_check_chunk, chunk))
+            if len(pending) >= self._max_pending:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+    def check_batch(self, records: Iterable[Any]) -> BatchResult:
+        """
+        Check records against the schema, collecting all results.
+
+        Returns:
+            BatchResult: which records passed, and the errors of those
+            that did not.
+        """
+        res = BatchResult()
+        for chunk in self.validate_chunks(records):
+            base = len(res.ok)
+            res.ok.extend(chunk.ok)
+            res.errors.extend((base + i, msg) for i, msg in chunk.errors)
+        return res
+
+    def close(self):
+        """
+        Shut down the worker processes.
+        """
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def __enter__(self) -> 'ValidationPool':
+        return self
+
+    def __exit__(self,
+                 exc_type: Optional[Type[BaseException]],
+                 exc: Optional[BaseException],
+                 tb: Optional[TracebackType]) -> None:
+        self.close()
+
+def _chunks(records: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    chunk = []
+    for rec in records:
+        chunk.append(rec)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
@@ -0,0 +1,57 @@
+# Copyright 2024 The CUE Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# 	http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Precompiled CUE paths.
+"""
+
+from typing import Any, final
+import libcue
+
+@final
+class Path:
+    """
+    A CUE path, encoded once for use in many lookups.
+
+    Looking up a str path encodes it for libcue on every call. A Path
+    holds the encoded path, so looking up the same path in many values
+    does not pay that cost again. Paths are immutable and may be
+    shared between threads.
+
+    Args:
+        path: CUE path, such as "a.b.c".
+    """
+
+    __slots__ = ('_path', '_buf')
+
+    _path: str
+    _buf: Any
+
+    def __init__(self, path: str):
+        self._path = path
+        self._buf = libcue.ffi.new("char[]", path.encode("utf-8"))
+
+    def __str__(self) -> str:
+        return self._path
+
+    def __repr__(self) -> str:
+        return f"Path({self._path!r})"
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, Path):
+            return self._path == other._path
+        return False
+
+    def __hash__(self) -> int:
+        return hash(self._path)
@@ -0,0 +1,208 @@
+# Copyright 2024 The CUE Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# 	http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Profile calls into libcue.
+
+With profiling on, every call into libcue is timed and counted, along
+with the bytes passed through buffers in each direction, such as CUE
+source in and JSON out. Comparing the time spent in libcue with the
+total time of an operation tells how much went to Python-side work
+such as marshalling.
+
+Profiling is off by default and costs nothing while off. Turn it on
+for the whole process with set_profiling and read the totals with
+stats, or profile a block of code:
+
+    with cue.profile() as p:
+        v = ctx.compile(src)
+        v.to_json()
+    print(p.stats()["cue_compile_string"].time)
+
+Calls are recorded from all threads, including calls made by other
+threads while a profile block is active.
+"""
+
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Tuple, final
+import threading
+import time
+import libcue.profile
+
+@dataclass(frozen=True)
+class CallStats:
+    """
+    Statistics about calls to a libcue function.
+
+    Times are in seconds.
+
+    Args:
+        calls: number of calls.
+        time: total time spent in the calls.
+        time_max: longest call.
+        bytes_in: bytes passed to libcue.
+        bytes_out: bytes returned by libcue.
+    """
+    calls: int
+    time: float
+    time_max: float
+    bytes_in: int
+    bytes_out: int
+
+    @property
+    def time_mean(self) -> float:
+        """
+        The average time of a call.
+        """
+        return self.time / self.calls if self.calls else 0.0
+
+@final
+class Profile:
+    """
+    Calls into libcue recorded while profiling.
+
+    Attributes:
+        elapsed: wall time of the profiled block in seconds, or None
+            while it is still running or for the global profile.
+    """
+
+    _calls: Dict[str, List[int]]
+    elapsed: Optional[float]
+
+    def __init__(self):
+        self._calls = {}
+        self.elapsed = None
+
+    def _add(self, name: str, ns: int, n_in: int, n_out: int):
+        c = self._calls.get(name)
+        if c is None:
+            self._calls[name] = [1, ns, ns, n_in, n_out]
+            return
+        c[0] += 1
+        c[1] += ns
+        if ns > c[2]:
+            c[2] = ns
+        c[3] += n_in
+        c[4] += n_out
+
+    def stats(self) -> Dict[str, CallStats]:
+        """
+        Return statistics per libcue function, keyed by C name, such
+        as cue_compile_string. Functions never called are omitted.
+        """
+        with _lock:
+            return {
+                name: CallStats(
+                    calls=c[0],
+                    time=c[1] / 1e9,
+                    time_max=c[2] / 1e9,
+                    bytes_in=c[3],
+                    bytes_out=c[4],
+                )
+                for name, c in self._calls.items()
+            }
+
+    def total(self) -> float:
+        """
+        Return the total time spent in libcue in seconds.
+        """
+        with _lock:
+            return sum(c[1] for c in self._calls.values()) / 1e9
+
+    def clear(self):
+        """
+        Forget the calls recorded so far.
+        """
+        with _lock:
+            self._calls.clear()
+
+# Guards the profiles and the set receiving calls. It is reentrant
+# because recording can run the garbage collector, and finalizers can
+# release handles, which is a call into libcue.
+_lock = threading.RLock()
+
+_global = Profile()
+_enabled = False
+_blocks: List[Profile] = []
+
+# Profiles receiving calls, replaced rather than modified so it can
+# be read without taking _lock.
+_sinks: Tuple[Profile, ...] = ()
+
+def _record(name: str, ns: int, n_in: int, n_out: int):
+    with _lock:
+        for p in _sinks:
+            p._add(name, ns, n_in, n_out)
+
+def _update():
+    # must be called with _lock held.
+    global _sinks
+    _sinks = ((_global,) if _enabled else ()) + tuple(_blocks)
+    if _sinks and not libcue.profile.instrumented():
+        libcue.profile.instrument(_record)
+    elif not _sinks:
+        libcue.profile.restore()
+
+def set_profiling(enabled: bool):
+    """
+    Turn process-wide profiling on or off.
+
+    Statistics collected so far are kept; see reset_stats.
+    """
+    global _enabled
+    with _lock:
+        _enabled = enabled
+        _update()
+
+def profiling_enabled() -> bool:
+    """
+    Report whether process-wide profiling is on.
+    """
+    return _enabled
+
+def stats() -> Dict[str, CallStats]:
+    """
+    Return the statistics collected by process-wide profiling.
+
+    See Profile.stats.
+    """
+    return _global.stats()
+
+def reset_stats():
+    """
+    Forget the statistics collected by process-wide profiling.
+    """
+    _global.clear()
+
+@contextmanager
+def profile() -> Iterator[Profile]:
+    """
+    Profile the calls into libcue made within a with block.
+
+    Blocks can be nested; each one records its own calls. Process-wide
+    profiling is unaffected.
+    """
+    p = Profile()
+    with _lock:
+        _blocks.append(p)
+        _update()
+    start = time.perf_counter()
+    try:
+        yield p
+    finally:
+        p.elapsed = time.perf_counter() - start
+        with _lock:
+            _blocks.remove(p)
+            _update()
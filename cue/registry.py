@@ -0,0 +1,348 @@
+# Copyright 2024 The CUE Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# 	http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Register schemas by name.
+
+A SchemaRegistry holds the sources of many schemas and compiles each
+once, either when it is registered, when it is first used, or all at
+once with warm_up:
+
+    registry = cue.SchemaRegistry()
+    registry.add_dir("schemas")
+    registry.warm_up()
+    registry["user"].check({"name": "Alice"})
+
+Processes and fork: the Go runtime inside libcue is started when cue
+is imported and does not survive fork, so no registry can be used in
+a forked child, not even one that compiled nothing before the fork:
+doing so raises RuntimeError. As with ValidationPool, run workers in
+processes started with the "spawn" method, or that import cue only
+after forking, and fill and warm up a registry in each of them.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Tuple, final
+from cue.batch import BatchResult, _to_record
+from cue.build import BuildOption, FileName
+from cue.context import Context
+from cue.eval import EvalOption
+from cue.value import Value
+import os
+import pathlib
+import threading
+import time
+
+@dataclass(frozen=True)
+class RegistryStats:
+    """
+    Statistics about a SchemaRegistry.
+
+    Times are in seconds.
+
+    Args:
+        schemas: number of registered schemas.
+        compiled: number of schemas compiled so far.
+        source_bytes: total size of the schema sources held.
+        compile_time: total time spent compiling schemas.
+        warm_up_time: wall time of the last warm_up, or None.
+    """
+    schemas: int
+    compiled: int
+    source_bytes: int
+    compile_time: float
+    warm_up_time: Optional[float]
+
+@final
+class RegisteredSchema:
+    """
+    A schema in a SchemaRegistry.
+
+    Attributes:
+        name: name the schema is registered under.
+        origin: file the schema was read from, or None.
+        compile_time: time spent compiling the schema in seconds,
+            or None if it is not compiled yet.
+    """
+
+    name: str
+    origin: Optional[str]
+    compile_time: Optional[float]
+
+    _registry: 'SchemaRegistry'
+    _source: bytes
+    _opts: Tuple[BuildOption, ...]
+    _value: Optional[Value]
+    _lock: threading.Lock
+
+    def __init__(self, registry: 'SchemaRegistry', name: str, source: bytes, opts: Tuple[BuildOption, ...], origin: Optional[str]):
+        self.name = name
+        self.origin = origin
+        self.compile_time = None
+        self._registry = registry
+        self._source = source
+        self._opts = opts
+        self._value = None
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return f"RegisteredSchema({self.name!r})"
+
+    @property
+    def source(self) -> bytes:
+        """The source of the schema."""
+        return self._source
+
+    @property
+    def compiled(self) -> bool:
+        """Whether the schema is compiled."""
+        return self._value is not None
+
+    def value(self) -> Value:
+        """
+        Return the schema, compiling it if needed.
+
+        Raises:
+            Error: if the schema does not compile.
+        """
+        v = self._value
+        if v is None or _forked:
+            v = self._compile()
+        return v
+
+    def _compile(self) -> Value:
+        ctx = self._registry.context
+        # schemas compile in parallel, each at most once.
+        with self._lock:
+            if self._value is not None:
+                return self._value
+            start = time.perf_counter()
+            # registered schemas outlive any arena active when they
+            # happen to be compiled.
+            v = ctx.compile(self._source, *self._opts).detach()
+            self.compile_time = time.perf_counter() - start
+            self._value = v
+            return v
+
+    def check(self, value: Any, *opts: EvalOption) -> None:
+        """
+        Ensure a value conforms to the schema.
+
+        Args:
+            value: a Value of the registry's Context, a JSON document
+                as bytes, or a Python object accepted by
+                Context.to_value.
+            *opts: evaluation options.
+
+        Raises:
+            Error: if the value does not conform to the schema.
+        """
+        schema = self.value()
+        _to_record(self._registry.context, value).check_schema(schema, *opts)
+
+    def check_many(self, records: Any, *opts: EvalOption) -> BatchResult:
+        """
+        Check many records against the schema.
+
+        See Context.validate_batch.
+        """
+        return self._registry.context.validate_batch(self.value(), records, *opts)
+
+@final
+class SchemaRegistry:
+    """
+    Schemas registered by name, compiled once each.
+
+    Lookups by name are dictionary lookups. A registry may be shared
+    between threads; each schema is compiled at most once.
+
+    Args:
+        ctx: context to compile schemas in, by default a new one.
+        lazy: if True, compile schemas when first used or warmed up
+            rather than when registered.
+    """
+
+    _ctx: Optional[Context]
+    _lazy: bool
+    _schemas: Dict[str, RegisteredSchema]
+    _lock: threading.Lock
+    _warm_up_time: Optional[float]
+
+    def __init__(self, ctx: Optional[Context] = None, lazy: bool = True):
+        self._ctx = ctx
+        self._lazy = lazy
+        self._schemas = {}
+        self._lock = threading.Lock()
+        self._warm_up_time = None
+
+    @property
+    def context(self) -> Context:
+        """
+        The context schemas are compiled in.
+
+        Raises:
+            RuntimeError: in a process forked after cue was imported.
+        """
+        if _forked:
+            raise RuntimeError("libcue does not survive fork; use schema registries in "
+                               "processes started with the spawn method instead")
+        if self._ctx is None:
+            with self._lock:
+                if self._ctx is None:
+                    self._ctx = Context()
+        return self._ctx
+
+    def __getitem__(self, name: str) -> RegisteredSchema:
+        return self._schemas[name]
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._schemas
+
+    def __len__(self) -> int:
+        return len(self._schemas)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._schemas)
+
+    def add(self, name: str, source: str | bytes, *opts: BuildOption) -> RegisteredSchema:
+        """
+        Register a schema from source.
+
+        Args:
+            name: name to register the schema under.
+            source: CUE source of the schema.
+            *opts: build options used to compile the schema.
+
+        Returns:
+            RegisteredSchema: the registered schema.
+
+        Raises:
+            ValueError: if a schema is already registered as name.
+            Error: if the registry is not lazy and the schema does
+                not compile.
+        """
+        src = source.encode("utf-8") if isinstance(source, str) else source
+        return self._add(name, src, opts, None)
+
+    def add_file(self, path: str | os.PathLike[str], *opts: BuildOption, name: Optional[str] = None) -> RegisteredSchema:
+        """
+        Register a schema from a file.
+
+        Args:
+            path: the file holding the schema.
+            *opts: build options used to compile the schema. Unless a
+                FileName is given, the path is used.
+            name: name to register the schema under, by default the
+                file name without extension.
+
+        Returns:
+            RegisteredSchema: the registered schema.
+
+        Raises:
+            ValueError: if a schema is already registered as name.
+            OSError: if the file can not be read.
+            Error: if the registry is not lazy and the schema does
+                not compile.
+        """
+        p = pathlib.Path(path)
+        if not any(isinstance(opt, FileName) for opt in opts):
+            opts = (FileName(str(p)),) + opts
+        return self._add(name or p.stem, p.read_bytes(), opts, str(p))
+
+    def add_dir(self, path: str | os.PathLike[str], *opts: BuildOption, pattern: str = "*.cue") -> List[RegisteredSchema]:
+        """
+        Register a schema from each file in a directory.
+
+        Each schema is named after the path of its file relative to
+        the directory, without extension, such as "user" or, with a
+        pattern like "**/*.cue", "v1/user".
+
+        Args:
+            path: the directory.
+            *opts: build options used to compile every schema.
+            pattern: glob pattern selecting the files.
+
+        Returns:
+            List[RegisteredSchema]: the registered schemas, ordered
+            by name.
+        """
+        root = pathlib.Path(path)
+        files = sorted(p for p in root.glob(pattern) if p.is_file())
+        return [self.add_file(p, *opts, name=p.relative_to(root).with_suffix("").as_posix()) for p in files]
+
+    def warm_up(self, max_workers: Optional[int] = None) -> float:
+        """
+        Compile all schemas not compiled yet.
+
+        Schemas compile in parallel on a thread pool.
+
+        Args:
+            max_workers: number of threads.
+
+        Returns:
+            float: the time warm-up took, in seconds.
+
+        Raises:
+            Error: the error of the first schema that does not compile.
+        """
+        start = time.perf_counter()
+        pending = [s for s in self._schemas.values() if not s.compiled]
+        if pending:
+            with ThreadPoolExecutor(max_workers=max_workers) as ex:
+                for _ in ex.map(RegisteredSchema.value, pending):
+                    pass
+        self._warm_up_time = time.perf_counter() - start
+        return self._warm_up_time
+
+    def stats(self) -> RegistryStats:
+        """
+        Report how many schemas are compiled, the memory their
+        sources take and the time spent compiling them.
+        """
+        schemas = list(self._schemas.values())
+        return RegistryStats(
+            schemas=len(schemas),
+            compiled=sum(s.compiled for s in schemas),
+            source_bytes=sum(len(s.source) for s in schemas),
+            compile_time=sum(s.compile_time or 0.0 for s in schemas),
+            warm_up_time=self._warm_up_time,
+        )
+
+    def _add(self, name: str, source: bytes, opts: Tuple[BuildOption, ...], origin: Optional[str]) -> RegisteredSchema:
+        schema = RegisteredSchema(self, name, source, opts, origin)
+        with self._lock:
+            if name in self._schemas:
+                raise ValueError(f"schema {name!r} is already registered")
+            self._schemas[name] = schema
+        if not self._lazy:
+            try:
+                schema.value()
+            except BaseException:
+                with self._lock:
+                    del self._schemas[name]
+                raise
+        return schema
+
+# Whether this process was forked after cue was imported, leaving
+# libcue unusable.
+_forked = False
+
+def _after_fork():
+    global _forked
+    _forked = True
+
+# fork, and with it register_at_fork, is Unix-only.
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork)
@@ -14,40 +14,232 @@
 
 """
 Manage lifecycle of CUE resources coming from the CUE Go API.
+
+Resources may be used, closed and garbage collected from any thread.
+Every handle is released exactly once: taking ownership of a handle
+for release is serialized by _lock.
+
+Live handles are counted by kind in _registry; see cue.debug.
 """
 
-from typing import Any, Callable, final
+from contextvars import ContextVar
+from typing import Any, Callable, ClassVar, Dict, List, Optional, Tuple, TypeVar, final
+import atexit
+import functools
+import os
+import sys
+import threading
+import traceback
 import libcue
 
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+    from cue.arena import Arena
+
+# Number of pending handles that triggers a batched release.
+_RELEASE_THRESHOLD = 1024
+
+# Guards taking ownership of handles for release. It is reentrant
+# because allocating while holding it can run the garbage collector,
+# and with it finalizers that need it too.
+_lock = threading.RLock()
+
+@final
+class _ReleaseQueue:
+    """
+    Handles waiting to be released.
+
+    Releasing a handle is a call into libcue. Rather than paying for
+    one call per dead resource, handles are collected here and
+    released in batches through cue_free_all.
+    """
+
+    _pending: List[int]
+    threshold: int
+
+    def __init__(self, threshold: int):
+        self._pending = []
+        self.threshold = threshold
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def push(self, v: int):
+        # Append under the lock, so that a handle is never added to a
+        # list flush has already taken.
+        with _lock:
+            self._pending.append(v)
+            full = len(self._pending) >= self.threshold
+        if full:
+            self.flush()
+
+    def flush(self) -> int:
+        """
+        Release all pending handles, returning how many were released.
+        """
+        # Swap the list first: finalizers that run while we are
+        # releasing, for example because ffi.new triggered the garbage
+        # collector, or on other threads, append to the new list
+        # instead.
+        with _lock:
+            pending, self._pending = self._pending, []
+        return _free_all(pending)
+
+def _free_all(vals: List[int]) -> int:
+    """
+    Release handles with a single call into libcue.
+    """
+    n = len(vals)
+    if n == 0:
+        return 0
+
+    # cue_free_all takes a zero-terminated array.
+    handles = libcue.ffi.new("uintptr_t[]", n + 1)
+    handles[0:n] = vals[:n]
+    libcue.free_all(handles)
+    return n
+
+_release_queue = _ReleaseQueue(_RELEASE_THRESHOLD)
+atexit.register(_release_queue.flush)
+
+# Frames in this package, and in functools, which dispatches methods
+# such as Context.compile, are skipped when capturing allocation sites.
+_PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__)) + os.sep
+_FUNCTOOLS = functools.__file__
+
 @final
+class _Registry:
+    """
+    Handles owned by resources, by kind.
+
+    A handle is live from the creation of its resource until the
+    resource takes it for release. While capturing, the allocation
+    site of every new handle is kept until then as well.
+    """
+
+    live: Dict[str, int]
+    peak: Dict[str, int]
+    created: Dict[str, int]
+    sites: Optional[Dict[int, Tuple[str, traceback.StackSummary]]]
+    depth: int
+
+    def __init__(self, kinds: Tuple[str, ...]):
+        self.live = dict.fromkeys(kinds, 0)
+        self.peak = dict.fromkeys(kinds, 0)
+        self.created = dict.fromkeys(kinds, 0)
+        self.sites = None
+        self.depth = 0
+
+    def add(self, kind: str, v: int):
+        site = _site(self.depth) if self.sites is not None else None
+        with _lock:
+            n = self.live[kind] = self.live.get(kind, 0) + 1
+            if n > self.peak.get(kind, 0):
+                self.peak[kind] = n
+            self.created[kind] = self.created.get(kind, 0) + 1
+            if site is not None and self.sites is not None:
+                self.sites[v] = (kind, site)
+
+    def remove(self, kind: str, v: int):
+        # must be called with _lock held.
+        self.live[kind] -= 1
+        if self.sites is not None:
+            self.sites.pop(v, None)
+
+def _site(depth: int) -> traceback.StackSummary:
+    """
+    Capture the innermost depth frames outside this package.
+    """
+    f: Any = sys._getframe(1)
+    while f is not None and (f.f_code.co_filename.startswith(_PACKAGE_DIR) or f.f_code.co_filename == _FUNCTOOLS):
+        f = f.f_back
+    site = traceback.StackSummary.extract(traceback.walk_stack(f), limit=depth)
+    site.reverse()
+    return site
+
+_registry = _Registry(("context", "value", "error"))
+
+# The innermost active arena, if any. Resources created while an
+# arena is active are tracked by the innermost active arena of their
+# Context; see Arena._owner.
+_current_arena: ContextVar[Optional['Arena']] = ContextVar("cue_arena", default=None)
+
+R = TypeVar('R', bound='_Resource')
+
 class _Resource:
     """
     A CUE resource.
 
     Resource holds any external value that is managed by the CUE Go API.
+
+    Resources are released immediately by close, together with
+    the other resources of their arena, or queued for a batched
+    release when they are garbage collected.
+
+    Objects that own a handle, such as Value, derive from Resource
+    rather than holding one, so that each handle costs a single
+    slotted Python object.
     """
 
+    __slots__ = ('_val', '_arena')
+
+    # Kind of handle, for accounting. Subclasses override it.
+    _kind: ClassVar[str] = "resource"
+
     _val: int
+    _arena: Optional['Arena']
 
     """
     Returns the underlying Go resoure handle.
     """
     def res(self) -> int:
-        if self._val != 0:
-            return self._val
+        v = self._val
+        if v != 0:
+            return v
         else:
             raise RuntimeError("Fatal: use of invalid resource.")
 
     def __init__(self, v: int):
         self._val = v
+        _registry.add(self._kind, v)
+        arena = _current_arena.get()
+        if arena is not None:
+            arena = arena._owner(self)
+            if arena is not None:
+                arena._track(self)
+        self._arena = arena
+
+    def detach(self: R) -> R:
+        """
+        Stop tracking the resource in its arena.
+        """
+        if self._arena is not None:
+            self._arena._untrack(self)
+            self._arena = None
+        return self
 
     def close(self):
-        if self._val != 0:
-            self.__release()
+        """
+        Release the resource immediately.
+        """
+        v = self._take()
+        if v != 0:
+            libcue.free(v)
+
+    def _take(self) -> int:
+        """
+        Take ownership of the handle for release.
 
-    def __release(self):
-        libcue.free(self._val)
-        self._val = 0
+        Returns the handle, or 0 if it was already taken. Concurrent
+        callers can not both observe the same handle.
+        """
+        with _lock:
+            v, self._val = self._val, 0
+            if v != 0:
+                _registry.remove(self._kind, v)
+        return v
 
     def __del__(self):
-        self.close()
+        v = self._take()
+        if v != 0:
+            _release_queue.push(v)
@@ -0,0 +1,38 @@
+# Copyright 2024 The CUE Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# 	http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Pytest plugin for code using cue.
+
+Enable it with `-p cue.testing`, or in a conftest.py:
+
+    pytest_plugins = ["cue.testing"]
+
+Then request the cue_leak_check fixture from tests, or from a whole
+module with:
+
+    pytestmark = pytest.mark.usefixtures("cue_leak_check")
+"""
+
+from typing import Iterator
+from cue import debug
+import pytest
+
+@pytest.fixture
+def cue_leak_check() -> Iterator[None]:
+    """
+    Fail the test if CUE handles it created are still live after it.
+    """
+    with debug.no_leaks():
+        yield
@@ -0,0 +1,191 @@
+# Copyright 2024 The CUE Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# 	http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Trace CUE operations.
+
+Context.compile, Value.unify, Value.check_schema, Value.validate and
+Value.to_json emit a span for each call to the installed Tracer, with
+attributes describing the call:
+
+    cue.source.size      bytes of source compiled
+    cue.options          options passed, as a list of str
+    cue.output.size      bytes of JSON produced
+    cue.error            whether the call raised an exception
+    cue.error.message    the message of that exception
+
+No tracer is installed by default, and then operations pay nothing
+beyond checking for one.
+
+Tracer is shaped after OpenTelemetry; its spans already satisfy Span,
+so adapting an OpenTelemetry tracer takes a few lines:
+
+    class OTelTracer:
+        def __init__(self, tracer):
+            self.tracer = tracer
+
+        def start_span(self, name, attributes):
+            return self.tracer.start_as_current_span(name, attributes=attributes)
+
+    cue.set_tracer(OTelTracer(opentelemetry.trace.get_tracer("cue")))
+"""
+
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, ContextManager, Dict, Iterable, Iterator, List, Mapping, Optional, Protocol, Sequence, TypeVar, final
+import threading
+import time
+
+T = TypeVar('T')
+
+AttributeValue = str | bool | int | float | Sequence[str]
+
+class Span(Protocol):
+    """
+    A span being recorded.
+    """
+
+    def set_attribute(self, key: str, value: AttributeValue) -> None:
+        """
+        Set an attribute on the span.
+        """
+        ...
+
+class Tracer(Protocol):
+    """
+    Receives spans for CUE operations.
+    """
+
+    def start_span(self, name: str, attributes: Mapping[str, AttributeValue]) -> ContextManager[Span]:
+        """
+        Start a span, which ends when the returned context manager
+        exits. Exceptions raised by the operation propagate through
+        the context manager.
+
+        Args:
+            name: name of the operation, such as cue.compile.
+            attributes: attributes known when the operation starts.
+        """
+        ...
+
+@dataclass
+class RecordedSpan:
+    """
+    A span recorded by a RecordingTracer.
+
+    Times are from time.perf_counter, in seconds.
+
+    Args:
+        name: name of the operation.
+        attributes: attributes of the span.
+        start: time the span started.
+        end: time the span ended, or None while it is running.
+        exception: exception the operation raised, if any.
+    """
+    name: str
+    attributes: Dict[str, AttributeValue] = field(default_factory=dict)
+    start: float = 0.0
+    end: Optional[float] = None
+    exception: Optional[BaseException] = None
+
+    def set_attribute(self, key: str, value: AttributeValue) -> None:
+        self.attributes[key] = value
+
+    @property
+    def duration(self) -> float:
+        """
+        The duration of the span, or 0 while it is running.
+        """
+        return self.end - self.start if self.end is not None else 0.0
+
+@final
+class RecordingTracer:
+    """
+    A Tracer keeping spans in memory, for tests and debugging.
+    """
+
+    _spans: List[RecordedSpan]
+    _lock: threading.Lock
+
+    def __init__(self):
+        self._spans = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def start_span(self, name: str, attributes: Mapping[str, AttributeValue]) -> Iterator[RecordedSpan]:
+        span = RecordedSpan(name, dict(attributes), time.perf_counter())
+        with self._lock:
+            self._spans.append(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.exception = e
+            raise
+        finally:
+            span.end = time.perf_counter()
+
+    def spans(self, name: Optional[str] = None) -> List[RecordedSpan]:
+        """
+        Return the spans recorded so far, in the order they started.
+
+        Args:
+            name: if given, only return spans with this name.
+        """
+        with self._lock:
+            return [s for s in self._spans if name is None or s.name == name]
+
+    def clear(self):
+        """
+        Forget the spans recorded so far.
+        """
+        with self._lock:
+            self._spans.clear()
+
+# The installed tracer. Instrumented operations read it once per call
+# and take their untraced path when it is None.
+_tracer: Optional[Tracer] = None
+
+def set_tracer(tracer: Optional[Tracer]):
+    """
+    Install tracer to receive spans, or remove it when None.
+    """
+    global _tracer
+    _tracer = tracer
+
+def get_tracer() -> Optional[Tracer]:
+    """
+    Return the installed tracer, if any.
+    """
+    return _tracer
+
+def _options(opts: Iterable[Any]) -> List[str]:
+    return [repr(opt) for opt in opts]
+
+def _run(tracer: Tracer, name: str, attributes: Mapping[str, AttributeValue], fn: Callable[[], T],
+         result: Optional[Callable[[T], Mapping[str, AttributeValue]]] = None) -> T:
+    """
+    Call fn within a span, recording its outcome.
+    """
+    with tracer.start_span(name, attributes) as span:
+        try:
+            r = fn()
+        except Exception as e:
+            span.set_attribute("cue.error", True)
+            span.set_attribute("cue.error.message", str(e))
+            raise
+        span.set_attribute("cue.error", False)
+        if result is not None:
+            for k, v in result(r).items():
+                span.set_attribute(k, v)
+        return r
@@ -16,38 +16,58 @@
 Perform operations on CUE values.
 """
 
-from typing import Any, Optional, final
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Tuple, TypeVar, final
 from cue.error import Error
-from cue.eval import EvalOption, encode_eval_opts
+from cue.eval import Concrete, EvalOption, encode_eval_opts
 from cue.kind import Kind, to_kind
-from cue.res import _Resource
+from cue.path import Path
+from cue.res import _Resource, _free_all
 from cue.result import Result, Ok, Err
+from cue import trace
+import decimal
+import errno
+import hashlib
+import json
+import threading
 import libcue
 
 from typing import TYPE_CHECKING
 if TYPE_CHECKING:
+    from cue.batch import BatchResult
+    from cue.cache import _LRUCache
     from cue.context import Context
 
+T = TypeVar('T')
+
 @final
-class Value:
+class Value(_Resource):
     """
     A CUE value.
 
     Value holds any value that can be encoded by CUE.
 
+    A Value owns its handle into libcue. The handle is released when
+    the Value is garbage collected, when close is called, or when the
+    arena the Value was created in exits.
+
     Corresponding Go functionality is documented at:
     https://pkg.go.dev/cuelang.org/go/cue#Value.
     """
 
+    __slots__ = ('_ctx', '_fingerprint')
+
+    _kind = "value"
+
     _ctx: 'Context'
-    _val: _Resource
+    # unset until first hashed; the 16-byte fingerprint if concrete,
+    # or an 8-byte digest of the kind and default otherwise.
+    _fingerprint: bytes
 
     def __init__(self, ctx: 'Context', v: int):
         self._ctx = ctx
-        self._val = _Resource(v)
+        _Resource.__init__(self, v)
 
-    def _res(self) -> int:
-        return self._val.res()
+    _res = _Resource.res
 
     def __eq__(self, other: Any) -> bool:
         """
@@ -69,6 +89,59 @@ class Value:
             return libcue.is_equal(self._res(), other._res())
         return False
 
+    def __hash__(self) -> int:
+        """
+        Hash the value consistently with __eq__.
+
+        Concrete values hash by fingerprint. Other values, for which
+        equality is not well defined, hash by kind and by the
+        fingerprint of their default, if any, so that *1 | int and
+        *2 | int hash apart.
+
+        The hash is computed by libcue the first time it is needed,
+        so the value must be live then: not closed and not released
+        by its arena. Later calls reuse the hash.
+
+        Raises:
+            RuntimeError: if the value was released before it was
+                first hashed.
+        """
+        return int.from_bytes(_digest(self)[:8], "little", signed=True)
+
+    def fingerprint(self) -> Optional[bytes]:
+        """
+        Return a digest of the structure of a concrete value.
+
+        Values that compare equal have the same fingerprint, which is
+        stable across processes: it is a digest of the canonical JSON
+        export of the value, with fields sorted and numbers
+        normalized. It is computed once per Value, which must be live
+        then, as for hashing.
+
+        A value is concrete if it validates with Concrete(True). Values
+        that only have a concrete default, such as *1 | int, are not:
+        their fingerprint is None, not that of their default.
+
+        Returns:
+            Optional[bytes]: a 16-byte digest, or None if the value is
+            not concrete.
+
+        Raises:
+            RuntimeError: if the value was released before its
+                fingerprint was first computed.
+        """
+        fp = _digest(self)
+        return fp if len(fp) == 16 else None
+
+    def detach(self) -> 'Value':
+        """
+        Let the value outlive the arena it was created in.
+
+        Returns:
+            Value: the value itself.
+        """
+        return _Resource.detach(self)
+
     def context(self) -> 'Context':
         """The Context that created this Value."""
         return self._ctx
@@ -80,21 +153,65 @@ class Value:
         Corresponding Go functionality is documented at:
         https://pkg.go.dev/cuelang.org/go/cue#Value.Unify
         """
-        v = libcue.unify(self._res(), other._res())
-        return Value(self._ctx, v)
+        tracer = trace._tracer
+        if tracer is None:
+            return _unify(self, other)
+        return trace._run(tracer, "cue.unify", {}, lambda: _unify(self, other))
 
-    def lookup(self, path: str) -> 'Value':
+    def lookup(self, path: str | Path) -> 'Value':
         """
         Return the CUE value at path.
 
         Args:
-            path: CUE path relative to self.
+            path: CUE path relative to self, as a str or a Path.
 
         Returns:
             Value: the value reached at path, starting from self.
+
+        Raises:
+            Error: if there is no value at path.
         """
         return _lookup(self, path)
 
+    def lookup_many(self, paths: Iterable[str | Path]) -> List[Result['Value', str]]:
+        """
+        Return the CUE values at several paths.
+
+        Unlike lookup, a missing path does not raise: its result holds
+        the CUE error instead.
+
+        Args:
+            paths: CUE paths relative to self, as str or Path.
+
+        Returns:
+            List[Result[Value, str]]: for each path, in order, the value
+            reached at it, or the CUE error as a string.
+        """
+        return _lookup_many(self, paths)
+
+    def extract(self, fields: Mapping[str | Path, Kind]) -> Dict[str | Path, Result[Any, str]]:
+        """
+        Decode several fields at once.
+
+        Looks up each path and decodes the value found there as the
+        given kind, all in one pass that reuses a single set of
+        out-parameters. Failures are reported per field instead of
+        raised.
+
+        Scalar kinds decode as with to_int, to_float, to_bool, to_str
+        and to_bytes; NULL decodes to None; NUMBER decodes to an int or
+        a float; STRUCT, LIST and TOP decode as with to_python.
+
+        Args:
+            fields: maps CUE paths, as str or Path, to the expected kind
+                of the value at that path.
+
+        Returns:
+            Dict[str | Path, Result[Any, str]]: for each path, the
+            decoded Python value, or the error as a string.
+        """
+        return _extract(self, fields)
+
     def to_int(self) -> int:
         """
         Convert CUE value to integer.
@@ -217,7 +334,85 @@ class Value:
             Error: if the CUE value can not be mashalled to JSON.
         """
 
-        return _to_json(self)
+        tracer = trace._tracer
+        if tracer is None:
+            return _to_json(self)
+        out = trace._run(tracer, "cue.to_json", {}, lambda: _to_json_bytes(self), _output_size)
+        return out.decode("utf-8")
+
+    def to_json_bytes(self) -> bytes:
+        """
+        Marshall CUE value to UTF-8 encoded JSON.
+
+        Like to_json, but returns the bytes produced by libcue with
+        a single copy and no decoding.
+
+        Returns:
+            bytes: the JSON encoding of the value
+
+        Raises:
+            Error: if the CUE value can not be mashalled to JSON.
+        """
+        tracer = trace._tracer
+        if tracer is None:
+            return _to_json_bytes(self)
+        return trace._run(tracer, "cue.to_json", {}, lambda: _to_json_bytes(self), _output_size)
+
+    def write_json(self, out: Any) -> int:
+        """
+        Marshall CUE value to JSON, writing it to out.
+
+        The JSON is written straight from memory owned by libcue,
+        without intermediate Python copies.
+
+        Args:
+            out: a binary file-like object with a write method, or a
+                writable buffer such as a bytearray or memoryview.
+
+        Returns:
+            int: the number of bytes written.
+
+        Raises:
+            Error: if the CUE value can not be mashalled to JSON.
+            ValueError: if out is a buffer too small for the JSON.
+            BlockingIOError: if out is a non-blocking file that can not
+                take more data; characters_written tells how many
+                bytes it took.
+        """
+        return _with_json(self, lambda buf: _write_buffer(buf, out))
+
+    def to_python(self, *,
+                  parse_int: Optional[Callable[[str], Any]] = None,
+                  parse_float: Optional[Callable[[str], Any]] = None,
+                  decode_bytes: bool = True) -> Any:
+        """
+        Convert CUE value to Python objects.
+
+        Structs become dicts, lists become lists, and scalars become
+        the corresponding Python scalars, following the JSON encoding
+        of the value. The JSON produced by libcue is parsed directly,
+        without building an intermediate Python string.
+
+        Args:
+            parse_int: called with the text of every integer, such
+                as to keep them as str; int by default.
+            parse_float: called with the text of every float, such
+                as decimal.Decimal; float by default.
+            decode_bytes: if the value itself is a CUE bytes, return
+                it as bytes instead of its base64 JSON encoding.
+                Bytes nested in structs or lists are always base64
+                strings.
+
+        Returns:
+            Any: a Python object denoting the same CUE value.
+
+        Raises:
+            Error: if the CUE value can not be mashalled to JSON.
+        """
+        if decode_bytes and libcue.concrete_kind(self._res()) == libcue.KIND_BYTES:
+            return _to_bytes(self)
+        return _with_json(self, lambda buf: json.loads(
+            buf[:], parse_int=parse_int, parse_float=parse_float))
 
     def default(self) -> Optional['Value']:
         """
@@ -281,10 +476,28 @@ class Value:
         https://pkg.go.dev/cuelang.org/go/cue#Value.Subsume
         """
 
-        eval_opts = encode_eval_opts(*opts)
-        err = libcue.instance_of(self._res(), schema._res(), eval_opts)
-        if err != 0:
-            raise Error(err)
+        tracer = trace._tracer
+        if tracer is None:
+            return _check_schema(self, schema, opts)
+        attributes = {"cue.options": trace._options(opts)}
+        trace._run(tracer, "cue.check_schema", attributes, lambda: _check_schema(self, schema, opts))
+
+    def check_many(self, records: Iterable[Any], *opts: EvalOption) -> 'BatchResult':
+        """
+        Check many records against this value as a schema.
+
+        See Context.validate_batch.
+
+        Args:
+            records: Values, JSON documents as bytes, or Python objects
+                accepted by Context.to_value.
+            *opts: evaluation options.
+
+        Returns:
+            BatchResult: which records passed, and the errors of those
+            that did not.
+        """
+        return self._ctx.validate_batch(self, records, *opts)
 
     def validate(self, *opts: EvalOption) -> None:
         """
@@ -299,99 +512,369 @@ class Value:
         Raises:
             Error: if the value contains errors.
         """
-        eval_opts = encode_eval_opts(*opts)
-        err = libcue.validate(self._res(), eval_opts)
-        if err != 0:
-            raise Error(err)
+        tracer = trace._tracer
+        if tracer is None:
+            return _validate(self, opts)
+        attributes = {"cue.options": trace._options(opts)}
+        trace._run(tracer, "cue.validate", attributes, lambda: _validate(self, opts))
+
+def _unify(val: Value, other: Value) -> Value:
+    v = libcue.unify(val._res(), other._res())
+    return Value(val._ctx, v)
+
+def _check_schema(val: Value, schema: Value, opts: Tuple[EvalOption, ...]) -> None:
+    cache = val._ctx._validation_cache
+    if cache is not None:
+        return _check_cached(cache, val, schema, opts)
+    eval_opts = encode_eval_opts(*opts)
+    err = libcue.instance_of(val._res(), schema._res(), eval_opts)
+    if err != 0:
+        raise Error(err)
+
+def _validate(val: Value, opts: Tuple[EvalOption, ...]) -> None:
+    cache = val._ctx._validation_cache
+    if cache is not None:
+        return _check_cached(cache, val, None, opts)
+    eval_opts = encode_eval_opts(*opts)
+    err = libcue.validate(val._res(), eval_opts)
+    if err != 0:
+        raise Error(err)
+
+# Validation cache entries: the error message, or None if the check
+# passed, and the values whose handles are part of the key. Keeping
+# them alive guarantees that their handles are not reused by other
+# values.
+_ValidationEntry = Tuple[Optional[str], Tuple[Value, ...]]
+
+def _check_cached(cache: '_LRUCache[_ValidationEntry]', val: Value, schema: Optional[Value], opts: Tuple[EvalOption, ...]) -> None:
+    """
+    Check val against schema, or validate it if schema is None,
+    replaying the outcome of an earlier check of the same Value.
+
+    Only a replayed failure raises an Error that holds just its
+    message; a check that runs raises the Error from libcue.
+    """
+    key = _validation_key(schema, opts, val)
+    entry = cache.get(key)
+    if entry is not None:
+        if entry[0] is not None:
+            raise Error(entry[0])
+        return
+    err = _check_err(val._res(), schema, encode_eval_opts(*opts))
+    e = None if err == 0 else Error(err)
+    cache.put(key, (None if e is None else str(e), _kept(schema, val)))
+    if e is not None:
+        raise e
+
+def _check_err(res: int, schema: Optional[Value], eval_opts: Any) -> int:
+    if schema is None:
+        return libcue.validate(res, eval_opts)
+    return libcue.instance_of(res, schema._res(), eval_opts)
+
+def _check_message(res: int, schema: Optional[Value], eval_opts: Any) -> Optional[str]:
+    err = _check_err(res, schema, eval_opts)
+    return None if err == 0 else str(Error(err))
+
+def _validation_key(schema: Optional[Value], opts: Tuple[EvalOption, ...], data: bytes | Value) -> Tuple[int, Tuple[EvalOption, ...], bytes | int]:
+    # Values are keyed by identity, through their handle: there is no
+    # export of a value that keeps every detail a check may depend on,
+    # such as kinds, hidden fields and definitions. Sources are keyed
+    # by a digest of their bytes.
+    d: bytes | int = data._res() if isinstance(data, Value) else data
+    return (0 if schema is None else schema._res(), opts, d)
+
+def _kept(schema: Optional[Value], data: bytes | Value) -> Tuple[Value, ...]:
+    return tuple(v for v in (schema, data) if isinstance(v, Value))
+
+def _cached_check(cache: '_LRUCache[_ValidationEntry]',
+                  schema: Optional[Value],
+                  opts: Tuple[EvalOption, ...],
+                  data: bytes | Value,
+                  check: Callable[[], Optional[str]]) -> Optional[str]:
+    """
+    Return the outcome of check, keyed by schema, options and the
+    data checked: a Value, or a digest of CUE source.
+    """
+    key = _validation_key(schema, opts, data)
+    entry = cache.get(key)
+    if entry is not None:
+        return entry[0]
+    msg = check()
+    cache.put(key, (msg, _kept(schema, data)))
+    return msg
 
 def _to_int(val: Value) -> int:
-    ptr = libcue.ffi.new("int64_t*")
+    ptr = _scratch().int64
     err = libcue.dec_int64(val._res(), ptr)
     if err != 0:
         raise Error(err)
     return ptr[0]
 
 def _to_unsigned(val: Value) -> int:
-    ptr = libcue.ffi.new("uint64_t*")
+    ptr = _scratch().uint64
     err = libcue.dec_uint64(val._res(), ptr)
     if err != 0:
         raise Error(err)
     return ptr[0]
 
 def _to_bool(val: Value) -> bool:
-    ptr = libcue.ffi.new("bool*")
+    ptr = _scratch().bool
     err = libcue.dec_bool(val._res(), ptr)
     if err != 0:
         raise Error(err)
     return ptr[0]
 
 def _to_float(val: Value) -> float:
-    ptr = libcue.ffi.new("double*")
+    ptr = _scratch().double
     err = libcue.dec_double(val._res(), ptr)
     if err != 0:
         raise Error(err)
     return ptr[0]
 
 def _to_str(val: Value) -> str:
-    ptr = libcue.ffi.new("char**")
+    ptr = _scratch().str
     err = libcue.dec_string(val._res(), ptr)
     if err != 0:
         raise Error(err)
-
-    dec = libcue.ffi.string(ptr[0])
-    if not isinstance(dec, bytes):
-        raise TypeError
-
-    s = dec.decode("utf-8")
-    libcue.libc_free(ptr[0])
-    return s
+    return _take_str(ptr[0])
 
 def _to_bytes(val: Value) -> bytes:
-    buf_ptr = libcue.ffi.new("uint8_t**")
-    len_ptr = libcue.ffi.new("size_t*")
-
-    err = libcue.dec_bytes(val._res(), buf_ptr, len_ptr)
+    scratch = _scratch()
+    err = libcue.dec_bytes(val._res(), scratch.buf, scratch.len)
     if err != 0:
         raise Error(err)
-
-    dec = libcue.ffi.buffer(buf_ptr[0], len_ptr[0])
-
-    # we slice the buffer to get a Python bytes instead of converting
-    # to bytes directly to work around the lack of precise type information
-    # in types-cffi.
-    b = dec[:]
-
-    libcue.libc_free(buf_ptr[0])
-    return b
+    return _take_bytes(scratch.buf[0], scratch.len[0])
 
 def _to_json(val: Value) -> str:
-    buf_ptr = libcue.ffi.new("uint8_t**")
-    len_ptr = libcue.ffi.new("size_t*")
+    return _with_json(val, lambda buf: buf[:].decode("utf-8"))
+
+def _digest(val: Value) -> bytes:
+    try:
+        return val._fingerprint
+    except AttributeError:
+        d = val._fingerprint = _fingerprint(val)
+        return d
+
+def _fingerprint(val: Value) -> bytes:
+    # the JSON export resolves defaults, so *1 | int would export as
+    # 1: check concreteness first.
+    err = libcue.validate(val._res(), encode_eval_opts(Concrete(True)))
+    if err != 0:
+        libcue.free(err)
+        return _incomplete_digest(val)
+    try:
+        doc = _with_json(val, lambda buf: json.loads(buf[:], parse_float=_canonical_float))
+    except Error:
+        return _incomplete_digest(val)
+    canonical = json.dumps(doc, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.blake2b(canonical.encode("utf-8"), digest_size=16).digest()
+
+def _incomplete_digest(val: Value) -> bytes:
+    # equality is undefined for values that are not concrete, so any
+    # digest of them is consistent with it; kind and default tell most
+    # such values apart.
+    h = hashlib.blake2b(libcue.incomplete_kind(val._res()).to_bytes(8, "little"), digest_size=8)
+    default = _default(val)
+    if default is not None:
+        h.update(_digest(default))
+        default.close()
+    return h.digest()
+
+def _canonical_float(s: str) -> int | float:
+    # the CUE numbers 1 and 1.0 compare equal, so they must
+    # fingerprint alike.
+    d = decimal.Decimal(s)
+    if d == d.to_integral_value():
+        return int(d)
+    return float(d)
+
+def _to_json_bytes(val: Value) -> bytes:
+    return _with_json(val, lambda buf: buf[:])
+
+def _output_size(out: bytes) -> Dict[str, trace.AttributeValue]:
+    return {"cue.output.size": len(out)}
+
+def _write_buffer(buf: Any, out: Any) -> int:
+    src = memoryview(buf)
+    n = len(src)
+
+    if hasattr(out, "write"):
+        # raw files may perform short writes.
+        written = 0
+        while written < n:
+            k = out.write(src[written:])
+            if k is None:
+                # a non-blocking raw file that would block. The JSON
+                # is gone once we return, so it can not be retried.
+                raise BlockingIOError(errno.EAGAIN, "write would block", written)
+            written += k
+        return n
+
+    dst = memoryview(out).cast("B")
+    if n > len(dst):
+        raise ValueError(f"buffer too small: need {n} bytes, have {len(dst)}")
+    dst[:n] = src
+    return n
+
+def _with_json(val: Value, consume: Callable[[Any], T]) -> T:
+    """
+    Call consume with the JSON encoding of val.
+
+    consume receives an ffi.buffer over memory owned by libcue, which
+    is freed when consume returns, so it must not retain the buffer.
+    """
+    return _with_json_res(val._res(), consume)
 
-    err = libcue.dec_json(val._res(), buf_ptr, len_ptr)
+def _with_json_res(res: int, consume: Callable[[Any], T]) -> T:
+    scratch = _scratch()
+    err = libcue.dec_json(res, scratch.buf, scratch.len)
     if err != 0:
         raise Error(err)
 
-    dec = libcue.ffi.string(buf_ptr[0], len_ptr[0])
-    if not isinstance(dec, bytes):
-        raise TypeError
-
-    s = dec.decode("utf-8")
-    libcue.libc_free(buf_ptr[0])
-    return s
+    # consume may decode other values, reusing the scratch space.
+    buf, n = scratch.buf[0], scratch.len[0]
+    try:
+        return consume(libcue.ffi.buffer(buf, n))
+    finally:
+        libcue.libc_free(buf)
 
-def _lookup(val: Value, path: str) -> Value:
-    val_ptr = libcue.ffi.new("cue_value*")
-    path_ptr = libcue.ffi.new("char[]", path.encode("utf-8"))
+def _lookup(val: Value, path: str | Path) -> Value:
+    val_ptr = _scratch().val
 
-    err = libcue.lookup_string(val._res(), path_ptr, val_ptr)
+    err = libcue.lookup_string(val._res(), _path_buf(path), val_ptr)
     if err != 0:
         raise Error(err)
     return Value(val._ctx, val_ptr[0])
 
+def _lookup_many(val: Value, paths: Iterable[str | Path]) -> List[Result[Value, str]]:
+    val_ptr = _scratch().val
+    res = val._res()
+
+    results: List[Result[Value, str]] = []
+    for path in paths:
+        err = libcue.lookup_string(res, _path_buf(path), val_ptr)
+        if err != 0:
+            results.append(Err(str(Error(err))))
+        else:
+            results.append(Ok(Value(val._ctx, val_ptr[0])))
+    return results
+
+def _path_buf(path: str | Path) -> Any:
+    if isinstance(path, Path):
+        return path._buf
+    return libcue.ffi.new("char[]", path.encode("utf-8"))
+
 def _default(val: Value) -> Optional[Value]:
-    ok_ptr = libcue.ffi.new("bool*")
+    ok_ptr = _scratch().bool
     res = libcue.default(val._res(), ok_ptr)
     if ok_ptr[0] == 1:
         return Value(val._ctx, res)
     return None
+
+@final
+class _Scratch:
+    """
+    Out-parameters for decoding values.
+
+    Allocating out-parameters with ffi.new on every call is a large
+    part of the cost of decoding small values, so each thread reuses
+    a single set, obtained from _scratch. Results must be read out of
+    the scratch space right after the call that filled it.
+    """
+
+    __slots__ = ('int64', 'uint64', 'bool', 'double', 'str', 'buf', 'len', 'val')
+
+    def __init__(self):
+        self.int64 = libcue.ffi.new("int64_t*")
+        self.uint64 = libcue.ffi.new("uint64_t*")
+        self.bool = libcue.ffi.new("bool*")
+        self.double = libcue.ffi.new("double*")
+        self.str = libcue.ffi.new("char**")
+        self.buf = libcue.ffi.new("uint8_t**")
+        self.len = libcue.ffi.new("size_t*")
+        self.val = libcue.ffi.new("cue_value*")
+
+_local = threading.local()
+
+def _scratch() -> _Scratch:
+    try:
+        return _local.scratch
+    except AttributeError:
+        scratch = _local.scratch = _Scratch()
+        return scratch
+
+def _extract(val: Value, fields: Mapping[str | Path, Kind]) -> Dict[str | Path, Result[Any, str]]:
+    scratch = _scratch()
+    res = val._res()
+
+    results: Dict[str | Path, Result[Any, str]] = {}
+    # field values are never exposed as Values, so their handles are
+    # released together at the end.
+    handles: List[int] = []
+    try:
+        for path, kind in fields.items():
+            err = libcue.lookup_string(res, _path_buf(path), scratch.val)
+            if err != 0:
+                results[path] = Err(str(Error(err)))
+                continue
+            handles.append(scratch.val[0])
+            results[path] = _decode(scratch.val[0], kind, scratch)
+    finally:
+        _free_all(handles)
+    return results
+
+def _decode(res: int, kind: Kind, scratch: _Scratch) -> Result[Any, str]:
+    match kind:
+        case Kind.INT:
+            err = libcue.dec_int64(res, scratch.int64)
+            return _decoded(err, lambda: scratch.int64[0])
+        case Kind.FLOAT:
+            err = libcue.dec_double(res, scratch.double)
+            return _decoded(err, lambda: scratch.double[0])
+        case Kind.BOOL:
+            err = libcue.dec_bool(res, scratch.bool)
+            return _decoded(err, lambda: scratch.bool[0])
+        case Kind.STRING:
+            err = libcue.dec_string(res, scratch.str)
+            return _decoded(err, lambda: _take_str(scratch.str[0]))
+        case Kind.BYTES:
+            err = libcue.dec_bytes(res, scratch.buf, scratch.len)
+            return _decoded(err, lambda: _take_bytes(scratch.buf[0], scratch.len[0]))
+        case Kind.NUMBER:
+            if libcue.concrete_kind(res) == libcue.KIND_INT:
+                return _decode(res, Kind.INT, scratch)
+            return _decode(res, Kind.FLOAT, scratch)
+        case Kind.NULL | Kind.STRUCT | Kind.LIST:
+            found = to_kind[libcue.concrete_kind(res)]
+            if found != kind:
+                return Err(f"expected {kind.name.lower()}, found {found.name.lower()}")
+            if kind == Kind.NULL:
+                return Ok(None)
+            return _decode_json(res)
+        case Kind.TOP:
+            return _decode_json(res)
+        case _:
+            return Err(f"can not decode {kind.name.lower()}")
+
+def _decoded(err: int, get: Callable[[], Any]) -> Result[Any, str]:
+    if err != 0:
+        return Err(str(Error(err)))
+    return Ok(get())
+
+def _decode_json(res: int) -> Result[Any, str]:
+    try:
+        return Ok(_with_json_res(res, lambda buf: json.loads(buf[:])))
+    except Error as e:
+        return Err(str(e))
+
+def _take_str(c_str: Any) -> str:
+    try:
+        return libcue.ffi.string(c_str).decode("utf-8")
+    finally:
+        libcue.libc_free(c_str)
+
+def _take_bytes(buf: Any, n: int) -> bytes:
+    try:
+        return libcue.ffi.buffer(buf, n)[:]
+    finally:
+        libcue.libc_free(buf)
@@ -16,111 +16,16 @@
 This module implements low-level bindings to libcue.
 """
 
-# In ABI mode the bindings from libcue are generated at runtime.
-# Silence the type checker about missing attributes (symbols) not
-# known at type-check time.
+# When the API-mode extension is not available, the bindings from
+# libcue are generated at runtime (ABI mode). Silence the type checker
+# about missing attributes (symbols) not known at type-check time.
 # mypy: disable-error-code="attr-defined"
 
 from typing import Optional
 from cffi import FFI
+from .cdef import CDEF
 import sys
 
-ffi = FFI()
-
-# We're mixing tabs and spaces because we want to be able to copy-paste
-# these declarations from libcue/cue.h.
-ffi.cdef("""
-    typedef uintptr_t cue_ctx;
-    typedef uintptr_t cue_value;
-    typedef uintptr_t cue_error;
-
-    typedef enum {
-    	CUE_KIND_BOTTOM,
-    	CUE_KIND_NULL,
-    	CUE_KIND_BOOL,
-    	CUE_KIND_INT,
-    	CUE_KIND_FLOAT,
-    	CUE_KIND_STRING,
-    	CUE_KIND_BYTES,
-    	CUE_KIND_STRUCT,
-    	CUE_KIND_LIST,
-    	CUE_KIND_NUMBER,
-    	CUE_KIND_TOP,
-    } cue_kind;
-
-    typedef enum {
-    	CUE_BUILD_NONE,
-    	CUE_BUILD_FILENAME,
-    	CUE_BUILD_IMPORT_PATH,
-    	CUE_BUILD_INFER_BUILTINS,
-    	CUE_BUILD_SCOPE,
-    } cue_bopt_tag;
-
-    typedef struct {
-    	cue_bopt_tag tag;
-    	cue_value value;
-    	char *str;
-    	bool b;
-    } cue_bopt;
-
-    typedef enum {
-    	CUE_OPT_NONE,
-    	CUE_OPT_ALL,
-    	CUE_OPT_ATTR,
-    	CUE_OPT_CONCRETE,
-    	CUE_OPT_DEFS,
-    	CUE_OPT_DISALLOW_CYCLES,
-    	CUE_OPT_DOCS,
-    	CUE_OPT_ERRORS_AS_VALUES,
-    	CUE_OPT_FINAL,
-    	CUE_OPT_HIDDEN,
-    	CUE_OPT_INLINE_IMPORTS,
-    	CUE_OPT_OPTIONALS,
-    	CUE_OPT_RAW,
-    	CUE_OPT_SCHEMA,
-    } cue_eopt_tag;
-
-    typedef struct {
-    	cue_eopt_tag tag;
-    	bool value;
-    } cue_eopt;
-
-    cue_ctx	cue_newctx(void);
-    char*	cue_error_string(cue_error);
-
-    cue_error	cue_compile_string(cue_ctx, char*, void*, cue_value*);
-    cue_error	cue_compile_bytes(cue_ctx, void*, size_t, void*, cue_value*);
-
-    cue_value	cue_top(cue_ctx);
-    cue_value	cue_bottom(cue_ctx);
-    cue_value	cue_unify(cue_value, cue_value);
-    cue_error	cue_instance_of(cue_value, cue_value, void*);
-    cue_error	cue_lookup_string(cue_value, char*, cue_value*);
-    cue_value	cue_from_int64(cue_ctx, int64_t);
-    cue_value	cue_from_uint64(cue_ctx, uint64_t);
-    cue_value	cue_from_bool(cue_ctx, bool);
-    cue_value	cue_from_double(cue_ctx, double);
-    cue_value	cue_from_string(cue_ctx, char*);
-    cue_value	cue_from_bytes(cue_ctx, void*, size_t);
-    cue_error	cue_dec_int64(cue_value, int64_t*);
-    cue_error	cue_dec_uint64(cue_value, uint64_t*);
-    cue_error	cue_dec_bool(cue_value, bool*);
-    cue_error	cue_dec_double(cue_value, double*);
-    cue_error	cue_dec_string(cue_value, char**);
-    cue_error	cue_dec_bytes(cue_value, uint8_t**, size_t*);
-    cue_error	cue_dec_json(cue_value, uint8_t**, size_t*);
-    cue_error	cue_validate(cue_value, void*);
-    cue_value	cue_default(cue_value, bool*);
-    cue_kind	cue_concrete_kind(cue_value);
-    cue_kind	cue_incomplete_kind(cue_value);
-    cue_error	cue_value_error(cue_value);
-    bool	cue_is_equal(cue_value, cue_value);
-
-    void	cue_free(uintptr_t);
-    void	cue_free_all(uintptr_t*);
-    void	libc_free(void*);
-""")
-
 # libcue shared object name on ELF platforms (default).
 libcue_so = "libcue.so"
 if sys.platform == "darwin":
@@ -130,26 +35,41 @@ elif sys.platform == "win32":
     # on Windows shared objects don't use `lib` prefix and end with dll.
     libcue_so = "cue.dll"
 
-if sys.platform != "win32":
-    # When there are no more references to lib (such as when there
-    # are no more references to this module), the Python runtime can
-    # try to unload libcue. Go shared libraries cannot be unloaded.
-    # Pass RTLD_NODELETE to dlopen to prevent this.
-    #
-    # Note that RTLD_NODELETE is Unix-only, so on Windows we do
-    # something different (see below).
-    #
-    # Also note that the Python garbage collector could run at program
-    # exit and it could determine that there are no more references
-    # to libcue (because the program is exiting), triggering a
-    # premature and dangerous dlclose. This prevents it.
-    lib = ffi.dlopen(libcue_so, ffi.RTLD_NODELETE)
-else:
-    # On Windows we don't have RTLD_NODELETE. Create an artificial
-    # global reference to lib, so we prevent unloading the shared
-    # library.
-    lib = ffi.dlopen(libcue_so)
-    sys.modules[__name__]._lib_reference = lib
+try:
+    # Prefer the out-of-line API-mode extension built by build.py.
+    # Its declarations are parsed and its calls are compiled ahead
+    # of time, so calling into libcue does not go through libffi.
+    from ._libcue import ffi, lib # type: ignore[import-not-found]
+    API_MODE = True
+
+    # cffi attaches FFI.CData, used in annotations throughout, to the
+    # class the first time an FFI is instantiated.
+    FFI()
+except ImportError:
+    ffi = FFI()
+    ffi.cdef(CDEF)
+    API_MODE = False
+
+    if sys.platform != "win32":
+        # When there are no more references to lib (such as when there
+        # are no more references to this module), the Python runtime can
+        # try to unload libcue. Go shared libraries cannot be unloaded.
+        # Pass RTLD_NODELETE to dlopen to prevent this.
+        #
+        # Note that RTLD_NODELETE is Unix-only, so on Windows we do
+        # something different (see below).
+        #
+        # Also note that the Python garbage collector could run at program
+        # exit and it could determine that there are no more references
+        # to libcue (because the program is exiting), triggering a
+        # premature and dangerous dlclose. This prevents it.
+        lib = ffi.dlopen(libcue_so, ffi.RTLD_NODELETE)
+    else:
+        # On Windows we don't have RTLD_NODELETE. Create an artificial
+        # global reference to lib, so we prevent unloading the shared
+        # library.
+        lib = ffi.dlopen(libcue_so)
+        sys.modules[__name__]._lib_reference = lib
 
 KIND_BOTTOM = lib.CUE_KIND_BOTTOM
 KIND_NULL = lib.CUE_KIND_NULL
@@ -279,5 +199,8 @@ def is_equal(x: int, y: int) -> bool:
 def free(x: int) -> None:
     lib.cue_free(x)
 
+def free_all(xs: FFI.CData) -> None:
+    lib.cue_free_all(xs)
+
 def libc_free(ptr: FFI.CData) -> None:
     lib.libc_free(ptr)
@@ -0,0 +1,76 @@
+# Copyright 2024 The CUE Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# 	http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Build the API-mode extension for libcue.
+
+The extension is compiled from the same declarations as the ABI-mode
+bindings and is picked up automatically by api.py when present.
+Building it requires a C compiler and libcue.
+
+Usage:
+
+    python libcue/build.py [LIBCUE_DIR]
+
+LIBCUE_DIR is the directory holding the libcue shared library, by
+default the current directory. The extension is written next to this
+file, and finds libcue at run time the same way the ABI-mode bindings
+do.
+"""
+
+from cffi import FFI
+import importlib.util
+import os
+import shutil
+import sys
+import tempfile
+
+# This script runs before the extension exists, so load the
+# declarations directly instead of importing the libcue package,
+# which would try to load libcue.
+_here = os.path.dirname(os.path.abspath(__file__))
+_spec = importlib.util.spec_from_file_location("_cdef", os.path.join(_here, "cdef.py"))
+assert _spec is not None and _spec.loader is not None
+_cdef = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(_cdef)
+
+# The declarations are valid C, so they double as the header for
+# the generated code.
+_preamble = """
+#include <stdbool.h>
+#include <stddef.h>
+#include <stdint.h>
+"""
+
+def ffibuilder(libcue_dir: str) -> FFI:
+    ffi = FFI()
+    ffi.cdef(_cdef.CDEF)
+    ffi.set_source(
+        "_libcue",
+        _preamble + _cdef.CDEF,
+        libraries=["cue"],
+        library_dirs=[libcue_dir],
+    )
+    return ffi
+
+def main(argv: list[str]) -> None:
+    libcue_dir = os.path.abspath(argv[1] if len(argv) > 1 else ".")
+    with tempfile.TemporaryDirectory() as tmpdir:
+        ext = ffibuilder(libcue_dir).compile(tmpdir=tmpdir)
+        dst = os.path.join(_here, os.path.basename(ext))
+        shutil.copy(ext, dst)
+    print(dst)
+
+if __name__ == "__main__":
+    main(sys.argv)
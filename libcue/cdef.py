@@ -0,0 +1,114 @@
+# Copyright 2024 The CUE Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# 	http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+C declarations of the libcue API.
+
+These are shared by the ABI-mode bindings in api.py and by the
+API-mode extension built by build.py.
+"""
+
+# We're mixing tabs and spaces because we want to be able to copy-paste
+# these declarations from libcue/cue.h.
+CDEF = """
+    typedef uintptr_t cue_ctx;
+    typedef uintptr_t cue_value;
+    typedef uintptr_t cue_error;
+
+    typedef enum {
+    	CUE_KIND_BOTTOM,
+    	CUE_KIND_NULL,
+    	CUE_KIND_BOOL,
+    	CUE_KIND_INT,
+    	CUE_KIND_FLOAT,
+    	CUE_KIND_STRING,
+    	CUE_KIND_BYTES,
+    	CUE_KIND_STRUCT,
+    	CUE_KIND_LIST,
+    	CUE_KIND_NUMBER,
+    	CUE_KIND_TOP,
+    } cue_kind;
+
+    typedef enum {
+    	CUE_BUILD_NONE,
+    	CUE_BUILD_FILENAME,
+    	CUE_BUILD_IMPORT_PATH,
+    	CUE_BUILD_INFER_BUILTINS,
+    	CUE_BUILD_SCOPE,
+    } cue_bopt_tag;
+
+    typedef struct {
+    	cue_bopt_tag tag;
+    	cue_value value;
+    	char *str;
+    	bool b;
+    } cue_bopt;
+
+    typedef enum {
+    	CUE_OPT_NONE,
+    	CUE_OPT_ALL,
+    	CUE_OPT_ATTR,
+    	CUE_OPT_CONCRETE,
+    	CUE_OPT_DEFS,
+    	CUE_OPT_DISALLOW_CYCLES,
+    	CUE_OPT_DOCS,
+    	CUE_OPT_ERRORS_AS_VALUES,
+    	CUE_OPT_FINAL,
+    	CUE_OPT_HIDDEN,
+    	CUE_OPT_INLINE_IMPORTS,
+    	CUE_OPT_OPTIONALS,
+    	CUE_OPT_RAW,
+    	CUE_OPT_SCHEMA,
+    } cue_eopt_tag;
+
+    typedef struct {
+    	cue_eopt_tag tag;
+    	bool value;
+    } cue_eopt;
+
+    cue_ctx	cue_newctx(void);
+    char*	cue_error_string(cue_error);
+
+    cue_error	cue_compile_string(cue_ctx, char*, void*, cue_value*);
+    cue_error	cue_compile_bytes(cue_ctx, void*, size_t, void*, cue_value*);
+
+    cue_value	cue_top(cue_ctx);
+    cue_value	cue_bottom(cue_ctx);
+    cue_value	cue_unify(cue_value, cue_value);
+    cue_error	cue_instance_of(cue_value, cue_value, void*);
+    cue_error	cue_lookup_string(cue_value, char*, cue_value*);
+    cue_value	cue_from_int64(cue_ctx, int64_t);
+    cue_value	cue_from_uint64(cue_ctx, uint64_t);
+    cue_value	cue_from_bool(cue_ctx, bool);
+    cue_value	cue_from_double(cue_ctx, double);
+    cue_value	cue_from_string(cue_ctx, char*);
+    cue_value	cue_from_bytes(cue_ctx, void*, size_t);
+    cue_error	cue_dec_int64(cue_value, int64_t*);
+    cue_error	cue_dec_uint64(cue_value, uint64_t*);
+    cue_error	cue_dec_bool(cue_value, bool*);
+    cue_error	cue_dec_double(cue_value, double*);
+    cue_error	cue_dec_string(cue_value, char**);
+    cue_error	cue_dec_bytes(cue_value, uint8_t**, size_t*);
+    cue_error	cue_dec_json(cue_value, uint8_t**, size_t*);
+    cue_error	cue_validate(cue_value, void*);
+    cue_value	cue_default(cue_value, bool*);
+    cue_kind	cue_concrete_kind(cue_value);
+    cue_kind	cue_incomplete_kind(cue_value);
+    cue_error	cue_value_error(cue_value);
+    bool	cue_is_equal(cue_value, cue_value);
+
+    void	cue_free(uintptr_t);
+    void	cue_free_all(uintptr_t*);
+    void	libc_free(void*);
+"""
@@ -0,0 +1,102 @@
+# Copyright 2024 The CUE Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# 	http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Instrumentation of calls into libcue.
+
+The wrappers in api.py look up lib on every call, so profiling is
+switched on by replacing it with a proxy that times each call and
+switched off by putting the original back. When profiling is off,
+calls pay nothing.
+"""
+
+# mypy: disable-error-code="attr-defined"
+
+from typing import Any, Callable, Dict, Tuple
+from . import api
+import time
+
+# Receives the name of the C function, its duration in nanoseconds
+# and the number of bytes passed in and returned through buffers.
+Recorder = Callable[[str, int, int, int], None]
+
+def _cstr(p: Any) -> int:
+    return len(api.ffi.string(p)) if p != api.ffi.NULL else 0
+
+# Bytes in and out of the calls that exchange buffers with libcue,
+# given the arguments and result of a call. Other calls count zero.
+_SIZES: Dict[str, Callable[[Tuple[Any, ...], Any], Tuple[int, int]]] = {
+    "cue_compile_string": lambda a, r: (_cstr(a[1]), 0),
+    "cue_compile_bytes": lambda a, r: (a[2], 0),
+    "cue_lookup_string": lambda a, r: (_cstr(a[1]), 0),
+    "cue_from_string": lambda a, r: (_cstr(a[1]), 0),
+    "cue_from_bytes": lambda a, r: (a[2], 0),
+    "cue_dec_string": lambda a, r: (0, 0 if r else _cstr(a[1][0])),
+    "cue_dec_bytes": lambda a, r: (0, 0 if r else a[2][0]),
+    "cue_dec_json": lambda a, r: (0, 0 if r else a[2][0]),
+    "cue_error_string": lambda a, r: (0, _cstr(r)),
+}
+
+class _Profiled:
+    """
+    Stands in for lib, forwarding calls and reporting them to record.
+    """
+
+    def __init__(self, lib: Any, record: Recorder):
+        self._lib = lib
+        self._record = record
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._lib, name)
+        if not callable(attr):
+            return attr
+        fn = _wrap(name, attr, self._record)
+        # cache the wrapper, so later lookups don't come here.
+        setattr(self, name, fn)
+        return fn
+
+def _wrap(name: str, fn: Callable[..., Any], record: Recorder) -> Callable[..., Any]:
+    size = _SIZES.get(name)
+
+    def call(*args):
+        start = time.perf_counter_ns()
+        r = fn(*args)
+        elapsed = time.perf_counter_ns() - start
+        n_in, n_out = size(args, r) if size is not None else (0, 0)
+        record(name, elapsed, n_in, n_out)
+        return r
+
+    return call
+
+_lib = api.lib
+
+def instrument(record: Recorder):
+    """
+    Report every following call into libcue to record.
+
+    record is called on the thread making the call, after it returns.
+    """
+    api.lib = _Profiled(_lib, record)
+
+def restore():
+    """
+    Stop reporting calls into libcue.
+    """
+    api.lib = _lib
+
+def instrumented() -> bool:
+    """
+    Report whether calls into libcue are being reported.
+    """
+    return api.lib is not _lib
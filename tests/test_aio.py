@@ -0,0 +1,96 @@
+# Copyright 2024 The CUE Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# 	http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+cue.aio tests.
+"""
+
+import asyncio
+import threading
+import pytest
+import cue
+import cue.aio
+
+def test_coroutines():
+    ctx = cue.Context()
+
+    async def main():
+        s = await cue.aio.compile(ctx, "x: int")
+        v = await cue.aio.compile(ctx, b"x: 42")
+        u = await cue.aio.unify(s, v)
+        await cue.aio.check_schema(v, s)
+        await cue.aio.validate(u, cue.Concrete(True))
+        assert await cue.aio.to_json(u) == '{"x":42}'
+
+        with pytest.raises(cue.Error):
+            await cue.aio.compile(ctx, "a: b: -")
+        with pytest.raises(cue.Error):
+            await cue.aio.check_schema(ctx.compile("x: true"), s)
+
+    asyncio.run(main())
+
+def test_back_pressure():
+    ctx = cue.Context()
+    executor = cue.aio.Executor(max_workers=2, max_pending=2)
+    release = threading.Event()
+    running = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def block():
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+        release.wait()
+        with lock:
+            running -= 1
+        return ctx.to_value(1)
+
+    async def main():
+        tasks = [asyncio.create_task(executor.run(block)) for _ in range(6)]
+        await asyncio.sleep(0.1)
+        assert executor.stats().pending == 2
+        release.set()
+        await asyncio.gather(*tasks)
+
+    asyncio.run(main())
+    executor.shutdown()
+
+    assert peak <= 2
+    stats = executor.stats()
+    assert stats.submitted == 6 and stats.completed == 6 and stats.pending == 0
+    assert stats.exec_time >= stats.exec_time_max > 0
+
+def test_cancel():
+    executor = cue.aio.Executor(max_workers=1, max_pending=2)
+    release = threading.Event()
+    ran = []
+
+    async def main():
+        first = asyncio.create_task(executor.run(release.wait))
+        second = asyncio.create_task(executor.run(ran.append, 1))
+        await asyncio.sleep(0.1)
+        second.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await second
+        release.set()
+        await first
+
+    asyncio.run(main())
+    executor.shutdown()
+
+    assert ran == []
+    stats = executor.stats()
+    assert stats.cancelled == 1 and stats.completed == 1
@@ -17,6 +17,7 @@ cue.Context tests.
 """
 
 import pytest
+import time
 import cue
 
 def test_compile_empty():
@@ -166,6 +167,36 @@ def test_to_value():
     val = ctx.to_value(b"world")
     assert val == ctx.compile("'world'")
 
+def test_to_value_tree():
+    ctx = cue.Context()
+
+    val = ctx.to_value(None)
+    assert val == ctx.compile("null")
+
+    val = ctx.to_value({"x": {"a": 1, "b": True}})
+    assert val == ctx.compile("x: { a: 1, b: true }")
+
+    val = ctx.to_value([1, "two", None, 3.5, (4, 5), {"x": []}])
+    assert val == ctx.compile('[1, "two", null, 3.5, [4, 5], { x: [] }]')
+
+    val = ctx.to_value({"a b": "héllo", "c": b"\x00'world'"})
+    assert val == ctx.compile(r"""{ "a b": "héllo", c: '\x00\'world\'' }""")
+    assert val.lookup("c").to_bytes() == b"\x00'world'"
+
+    with pytest.raises(TypeError):
+        ctx.to_value({"x": object()})
+
+    with pytest.raises(ValueError):
+        ctx.to_value([float("nan")])
+
+def test_to_value_key_collision():
+    ctx = cue.Context()
+
+    assert ctx.to_value({1: "a", "2": "b"}) == ctx.compile('{ "1": "a", "2": "b" }')
+    for obj in ({1: "a", "1": "a"}, [{"x": {True: 1, "true": 2}}], {"b": b"", "k": {None: 1, "null": 1}}):
+        with pytest.raises(TypeError, match="both convert to field"):
+            ctx.to_value(obj)
+
 def test_encoding_decoding_equal():
     ctx = cue.Context()
 
@@ -186,3 +217,211 @@ def test_encoding_decoding_equal():
 
     v = b"world"
     assert v == ctx.to_value(v).to_bytes()
+
+def test_compile_file(tmp_path):
+    ctx = cue.Context()
+    path = tmp_path / "x.cue"
+    path.write_text("x: 42")
+
+    val = ctx.compile_file(path)
+    assert val.lookup("x").to_int() == 42
+    assert ctx.compile_file(str(path), cue.FileName("y.cue")).lookup("x").to_int() == 42
+
+    empty = tmp_path / "empty.cue"
+    empty.write_text("")
+    assert isinstance(ctx.compile_file(empty), cue.Value)
+
+    with pytest.raises(FileNotFoundError):
+        ctx.compile_file(tmp_path / "missing.cue")
+
+def test_compile_file_error(tmp_path):
+    ctx = cue.Context()
+    path = tmp_path / "bad.cue"
+    path.write_text("x: {")
+
+    with pytest.raises(cue.Error, match="bad.cue"):
+        ctx.compile_file(path)
+
+def test_compile_files(tmp_path):
+    ctx = cue.Context()
+    paths = []
+    for i in range(10):
+        path = tmp_path / f"{i}.cue"
+        path.write_text(f"x: {i}")
+        paths.append(path)
+
+    with ctx.arena() as arena:
+        vals = ctx.compile_files(paths, max_workers=4)
+        assert [v.lookup("x").to_int() for v in vals] == list(range(10))
+        assert len(arena) >= 10
+
+    (tmp_path / "5.cue").write_text("x: {")
+    with pytest.raises(cue.Error, match="5.cue"):
+        ctx.compile_files(paths)
+
+def test_compile_cache():
+    ctx = cue.Context(compile_cache_size=2)
+    assert ctx.compile_cache_info() == cue.CacheInfo(hits=0, misses=0, evictions=0, size=0, maxsize=2)
+
+    a = ctx.compile("x: 42")
+    b = ctx.compile(b"x: 42")
+    assert a is b
+
+    c = ctx.compile("x: 42", cue.FileName("x.cue"))
+    assert c is not a
+    assert c == a
+
+    ctx.compile("y: 1")
+    info = ctx.compile_cache_info()
+    assert info == cue.CacheInfo(hits=1, misses=3, evictions=1, size=2, maxsize=2)
+
+    ctx.compile_cache_clear()
+    assert ctx.compile_cache_info().size == 0
+
+def test_compile_cache_disabled():
+    ctx = cue.Context()
+    assert ctx.compile_cache_info() is None
+    assert ctx.compile("x: 42") is not ctx.compile("x: 42")
+
+def test_compile_cache_error():
+    ctx = cue.Context(compile_cache_size=8)
+
+    with pytest.raises(cue.Error):
+        ctx.compile("a: b: -")
+    with pytest.raises(cue.Error):
+        ctx.compile("a: b: -")
+    assert ctx.compile_cache_info().size == 0
+
+def test_validation_cache():
+    ctx = cue.Context(validation_cache_size=4)
+    assert ctx.validation_cache_info() == cue.CacheInfo(hits=0, misses=0, evictions=0, size=0, maxsize=4)
+    schema = ctx.compile("x: int")
+
+    # values are keyed by identity.
+    one = ctx.compile("x: 1")
+    one.check_schema(schema)
+    one.check_schema(schema)
+    bad = ctx.compile('x: "one"')
+    errs = []
+    for _ in range(2):
+        with pytest.raises(cue.Error, match="conflicting values") as e:
+            bad.check_schema(schema)
+        errs.append(e.value)
+    # a check that runs raises the libcue error; only the replayed
+    # error just holds its message.
+    assert errs[0]._err is not None
+    assert errs[1]._err is None
+
+    one.validate(cue.Concrete(True))
+    info = ctx.validation_cache_info()
+    assert (info.hits, info.misses, info.size) == (2, 3, 3)
+    assert info.hit_rate == 2 / 5
+
+    # JSON documents and Python objects are keyed by their source,
+    # which for {"x": 1} is the JSON document {"x":1}.
+    res = ctx.validate_batch(schema, [b'{"x":1}', b'{"x":1}', {"x": 1}, b'{"x": true}'])
+    assert res.ok == [True, True, True, False]
+    info = ctx.validation_cache_info()
+    assert (info.hits, info.evictions) == (4, 1)
+
+    ctx.validation_cache_clear()
+    assert ctx.validation_cache_info().size == 0
+
+def test_validation_cache_lossless():
+    ctx = cue.Context(validation_cache_size=8)
+
+    res = ctx.validate_batch(ctx.compile("x: int"), [{"x": 1}, {"x": 1.0}])
+    assert res.ok == [True, False]
+
+    schema = ctx.compile("string")
+    ctx.to_value("YWJj").check_schema(schema)
+    with pytest.raises(cue.Error):
+        ctx.to_value(b"abc").check_schema(schema)
+
+def test_validation_cache_ttl():
+    ctx = cue.Context(validation_cache_size=4, validation_cache_ttl=0.01)
+    schema = ctx.compile("x: int")
+    val = ctx.compile("x: 1")
+
+    val.check_schema(schema)
+    time.sleep(0.05)
+    val.check_schema(schema)
+    info = ctx.validation_cache_info()
+    assert (info.hits, info.misses, info.expirations) == (0, 2, 1)
+
+    with pytest.raises(ValueError):
+        cue.Context(validation_cache_size=4, validation_cache_ttl=0)
+
+def test_validation_cache_disabled():
+    ctx = cue.Context()
+    assert ctx.validation_cache_info() is None
+
+def test_flush():
+    ctx = cue.Context()
+    ctx.flush()
+
+    for i in range(10):
+        ctx.to_value(i)
+    assert ctx.pending_releases() == 10
+
+    assert ctx.flush() == 10
+    assert ctx.pending_releases() == 0
+
+def test_arena():
+    ctx = cue.Context()
+
+    with ctx.arena() as arena:
+        a = ctx.compile("x: 42")
+        b = a.lookup("x")
+        c = ctx.to_value(42).detach()
+        assert b.to_int() == 42
+        assert len(arena) == 2
+
+    with pytest.raises(RuntimeError):
+        a.lookup("x")
+    with pytest.raises(RuntimeError):
+        b.to_int()
+    assert c.to_int() == 42
+    assert len(arena) == 0
+
+def test_arena_nested():
+    ctx = cue.Context()
+
+    with ctx.arena() as outer:
+        a = ctx.to_value(1)
+        with ctx.arena() as inner:
+            b = ctx.to_value(2)
+        assert len(outer) == 1 and len(inner) == 0
+        assert a.to_int() == 1
+        with pytest.raises(RuntimeError):
+            b.to_int()
+
+def test_arena_error():
+    ctx = cue.Context()
+
+    with pytest.raises(cue.Error, match="expected operand, found 'EOF'"):
+        with ctx.arena():
+            ctx.compile("a: b: -")
+
+def test_arena_other_context():
+    ctx = cue.Context()
+    other = cue.Context()
+
+    with ctx.arena() as outer:
+        a = other.to_value(1)
+        with other.arena() as inner:
+            b = ctx.to_value(2)
+            c = other.to_value(3)
+        assert len(inner) == 0
+        assert b.to_int() == 2
+        with pytest.raises(RuntimeError):
+            c.to_int()
+        assert len(outer) == 1
+    assert a.to_int() == 1
+    with pytest.raises(RuntimeError):
+        b.to_int()
+
+def test_arena_context():
+    with cue.Context().arena():
+        ctx = cue.Context()
+    assert ctx.to_value(1).to_int() == 1
@@ -0,0 +1,83 @@
+# Copyright 2024 The CUE Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# 	http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Handle accounting and leak detection tests.
+"""
+
+import gc
+import pytest
+import cue
+from cue.testing import cue_leak_check
+
+def test_handles():
+    cue.debug.reset_peaks()
+    before = cue.debug.handles()
+    ctx = cue.Context()
+    vals = [ctx.to_value(i) for i in range(10)]
+    try:
+        ctx.compile("x: {")
+    except cue.Error:
+        pass
+
+    after = cue.debug.handles()
+    assert after["context"].live == before["context"].live + 1
+    assert after["value"].live == before["value"].live + 10
+    assert after["value"].created == before["value"].created + 10
+    assert after["value"].peak >= after["value"].live
+
+    for v in vals:
+        v.close()
+    del vals
+    assert cue.debug.handles()["value"].live == before["value"].live
+    assert cue.debug.handles()["value"].peak == after["value"].peak
+
+    cue.debug.reset_peaks()
+    assert cue.debug.handles()["value"].peak == before["value"].live
+
+def test_leaks():
+    ctx = cue.Context()
+    cue.debug.track_allocations(True)
+    try:
+        assert cue.debug.tracking_allocations()
+        kept = ctx.to_value(1)
+        ctx.to_value(2)
+        [leak] = [l for l in cue.debug.leaks() if l.handle == kept._val]
+    finally:
+        cue.debug.track_allocations(False)
+
+    assert leak.kind == "value"
+    assert leak.site[-1].name == "test_leaks"
+    assert "test_leaks" in str(leak)
+    assert cue.debug.leaks() == []
+
+def test_no_leaks():
+    ctx = cue.Context()
+    kept = []
+    with pytest.raises(AssertionError, match="1 CUE handles leaked"):
+        with cue.debug.no_leaks():
+            ctx.to_value(1)
+            kept.append(ctx.to_value(2))
+    assert not cue.debug.tracking_allocations()
+
+    with cue.debug.no_leaks():
+        with ctx.arena():
+            ctx.to_value(3)
+        ctx.to_value(4).close()
+        ctx.to_value(5)
+        gc.collect()
+
+def test_leak_check_fixture(cue_leak_check):
+    ctx = cue.Context()
+    assert ctx.to_value(1).to_int() == 1
@@ -0,0 +1,88 @@
+# Copyright 2024 The CUE Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# 	http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Command line tests.
+"""
+
+import io
+import sys
+import pytest
+from cue.__main__ import main
+
+SCHEMA = "x: int"
+DATA = b'{"x": 1}\n\n{"x": "two"}\n{"x": 3}\n{"x": \n'
+
+@pytest.fixture
+def files(tmp_path):
+    schema = tmp_path / "schema.cue"
+    schema.write_text(SCHEMA)
+    data = tmp_path / "data.jsonl"
+    data.write_bytes(DATA)
+    return str(schema), str(data)
+
+@pytest.mark.parametrize("jobs", ["1", "2"])
+def test_validate(files, capsys, jobs):
+    schema, data = files
+    assert main(["validate", "-j", jobs, "--chunksize", "2", schema, data]) == 1
+
+    out, err = capsys.readouterr()
+    failed = [line.split(": ")[0] for line in out.splitlines() if not line.startswith(" ")]
+    assert failed == [f"{data}:3", f"{data}:5"]
+    assert "4 records, 2 failed" in err
+    assert "records/s" in err and "MB/s" in err
+
+def test_validate_ok(files, capsys):
+    schema, data = files
+    with open(data, "wb") as f:
+        f.write(b'{"x": 1}\n{"x": 2}\n')
+    assert main(["validate", "-q", schema, data]) == 0
+    out, err = capsys.readouterr()
+    assert out == ""
+    assert "2 records, 0 failed" in err
+
+@pytest.mark.parametrize("jobs", ["1", "2"])
+def test_validate_not_json(files, capsys, jobs):
+    schema, data = files
+    with open(data, "wb") as f:
+        f.write(b'{"x": 1}\nx: 2\n')
+    # lines are checked to be JSON in the workers.
+    assert main(["validate", "-j", jobs, schema, data]) == 1
+    out, err = capsys.readouterr()
+    assert out.startswith(f"{data}:2: invalid JSON")
+    assert "2 records, 1 failed" in err
+
+    # with --cue, lines may be any CUE.
+    assert main(["validate", "--cue", schema, data]) == 0
+
+def test_validate_stdin(files, capsys, monkeypatch):
+    schema, _ = files
+    stdin = io.TextIOWrapper(io.BytesIO(b'{"x": 1}\n'))
+    monkeypatch.setattr(sys, "stdin", stdin)
+    assert main(["validate", schema, "-"]) == 0
+    assert not stdin.buffer.closed
+    assert "1 records, 0 failed" in capsys.readouterr().err
+
+def test_validate_bad_input(files, capsys, tmp_path):
+    schema, data = files
+    assert main(["validate", schema, str(tmp_path / "missing.jsonl")]) == 2
+
+    # records checked before the missing input are still reported.
+    capsys.readouterr()
+    assert main(["validate", schema, data, str(tmp_path / "missing.jsonl")]) == 2
+    assert "records, " in capsys.readouterr().err
+
+    bad = tmp_path / "bad.cue"
+    bad.write_text("x: <")
+    assert main(["validate", str(bad), data]) == 2
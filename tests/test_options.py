@@ -0,0 +1,53 @@
+# Copyright 2024 The CUE Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# 	http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Evaluation and build option tests.
+"""
+
+import dataclasses
+import pytest
+import cue
+from cue.build import encode_build_opts
+from cue.eval import encode_eval_opts
+
+def test_options_hashable():
+    assert hash(cue.Concrete(True)) == hash(cue.Concrete(True))
+    assert {cue.FileName("a.cue"), cue.FileName("a.cue"), cue.ImportPath("a")} == {cue.FileName("a.cue"), cue.ImportPath("a")}
+
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        cue.Concrete(True).concrete = False # type: ignore[misc]
+
+def test_encode_eval_opts_cached():
+    assert encode_eval_opts() is None
+
+    a = encode_eval_opts(cue.Concrete(True), cue.Final())
+    b = encode_eval_opts(cue.Concrete(True), cue.Final())
+    c = encode_eval_opts(cue.Concrete(False), cue.Final())
+    assert a is b
+    assert a is not c
+
+def test_encode_build_opts_cached():
+    ctx = cue.Context()
+
+    a = encode_build_opts(cue.FileName("a.cue"), cue.ImportPath("example.com/a"))
+    b = encode_build_opts(cue.FileName("a.cue"), cue.ImportPath("example.com/a"))
+    assert a is b
+
+    scope = cue.Scope(ctx.compile("x: 1"))
+    assert encode_build_opts(scope) is not encode_build_opts(scope)
+
+    # the strings pointed to by cached arrays stay valid.
+    val = ctx.compile("y: x", cue.FileName("a.cue"), scope)
+    assert val.lookup("y").to_int() == 1
@@ -0,0 +1,47 @@
+# Copyright 2024 The CUE Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# 	http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+cue.parallel tests.
+"""
+
+import pytest
+import cue
+from cue.parallel import ValidationPool
+
+def test_validate():
+    records = [{"x": i} for i in range(10)] + [{"x": "ten"}, b'{"x": 11}', b'{"x": "twelve"}']
+
+    with ValidationPool("x: int", workers=2, chunksize=3) as pool:
+        assert pool.workers == 2
+        res = list(pool.validate(records))
+
+    assert len(res) == 13
+    assert all(isinstance(r, cue.Ok) for r in res[:10])
+    assert isinstance(res[10], cue.Err)
+    assert isinstance(res[11], cue.Ok)
+    assert isinstance(res[12], cue.Err)
+
+def test_check_batch():
+    records = [b'{"x": 1}', b'{"x": true}'] * 5
+
+    with ValidationPool(b"x: int", cue.FileName("schema.cue"), eval_opts=[cue.Concrete(True)], workers=2, chunksize=4) as pool:
+        res = pool.check_batch(records)
+
+    assert res.ok == [True, False] * 5
+    assert [i for i, _ in res.errors] == [1, 3, 5, 7, 9]
+
+def test_schema_error():
+    with pytest.raises(cue.Error):
+        ValidationPool("x: <", workers=1)
@@ -0,0 +1,71 @@
+# Copyright 2024 The CUE Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# 	http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Profiling tests.
+"""
+
+import cue
+import libcue
+
+def test_profile_block():
+    ctx = cue.Context()
+    src = "x: 1, y: \"hello\""
+    with cue.profile() as p:
+        v = ctx.compile(src)
+        assert v.lookup("y").to_str() == "hello"
+        assert v.to_json() == '{"x":1,"y":"hello"}'
+    assert not libcue.profile.instrumented()
+    assert p.elapsed is not None and p.elapsed >= p.total()
+
+    stats = p.stats()
+    assert stats["cue_compile_string"].calls == 1
+    assert stats["cue_compile_string"].bytes_in == len(src)
+    assert stats["cue_lookup_string"].bytes_in == len("y")
+    assert stats["cue_dec_string"].bytes_out == len("hello")
+    assert stats["cue_dec_json"].bytes_out == len('{"x":1,"y":"hello"}')
+    s = stats["cue_compile_string"]
+    assert 0 < s.time_max <= s.time and s.time_mean == s.time
+
+    # nothing is recorded outside the block.
+    ctx.compile(src)
+    assert p.stats()["cue_compile_string"].calls == 1
+
+def test_profile_nested():
+    ctx = cue.Context()
+    with cue.profile() as outer:
+        ctx.to_value(1)
+        with cue.profile() as inner:
+            ctx.to_value(2)
+    assert outer.stats()["cue_from_int64"].calls == 2
+    assert inner.stats()["cue_from_int64"].calls == 1
+
+def test_global_profiling():
+    ctx = cue.Context()
+    cue.reset_stats()
+    try:
+        cue.set_profiling(True)
+        assert cue.profiling_enabled()
+        ctx.to_value(1)
+        with cue.profile():
+            ctx.to_value(2)
+        assert libcue.profile.instrumented()
+    finally:
+        cue.set_profiling(False)
+    ctx.to_value(3)
+
+    assert not libcue.profile.instrumented()
+    assert cue.stats()["cue_from_int64"].calls == 2
+    cue.reset_stats()
+    assert cue.stats() == {}
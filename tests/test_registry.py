@@ -0,0 +1,97 @@
+# Copyright 2024 The CUE Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# 	http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+cue.SchemaRegistry tests.
+"""
+
+import os
+import pytest
+import cue
+
+def test_registry(tmp_path):
+    (tmp_path / "user.cue").write_text('name: string, age?: int')
+    (tmp_path / "v1").mkdir()
+    (tmp_path / "v1" / "order.cue").write_text('id: int')
+
+    registry = cue.SchemaRegistry()
+    registry.add("point", "x: int, y: int")
+    assert [s.name for s in registry.add_dir(tmp_path, pattern="**/*.cue")] == ["user", "v1/order"]
+    assert len(registry) == 3 and "v1/order" in registry
+    assert registry["user"].origin == str(tmp_path / "user.cue")
+
+    stats = registry.stats()
+    assert stats.schemas == 3 and stats.compiled == 0 and stats.warm_up_time is None
+    assert stats.source_bytes == len("x: int, y: int") + len('name: string, age?: int') + len('id: int')
+
+    registry["point"].check({"x": 1, "y": 2})
+    assert registry["point"].compiled and not registry["user"].compiled
+    with pytest.raises(cue.Error):
+        registry["point"].check({"x": "one", "y": 2})
+
+    elapsed = registry.warm_up(max_workers=2)
+    stats = registry.stats()
+    assert stats.compiled == 3 and stats.warm_up_time == elapsed
+    assert all(registry[name].compile_time is not None for name in registry)
+
+    registry["user"].check(b'{"name": "Alice"}', cue.Concrete(True))
+    res = registry["v1/order"].check_many([{"id": 1}, {"id": "two"}])
+    assert res.ok == [True, False]
+
+    with pytest.raises(ValueError):
+        registry.add("point", "x: string")
+    with pytest.raises(KeyError):
+        registry["missing"]
+
+def test_registry_eager():
+    registry = cue.SchemaRegistry(lazy=False)
+    assert registry.add("a", "a: int").compiled
+    with pytest.raises(cue.Error):
+        registry.add("b", "b: {")
+    assert "b" not in registry
+
+def test_registry_arena():
+    ctx = cue.Context()
+    registry = cue.SchemaRegistry(ctx)
+    registry.add("a", "a: int")
+    with ctx.arena():
+        registry["a"].check({"a": 1})
+    registry["a"].check({"a": 2})
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requires fork")
+def test_registry_fork():
+    registry = cue.SchemaRegistry()
+    registry.add("a", "a: int")
+    registry.warm_up()
+    unused = cue.SchemaRegistry()
+    unused.add("b", "b: int")
+
+    pid = os.fork()
+    if pid == 0:
+        # the child must not touch libcue, whether the registry
+        # compiled schemas before the fork or not.
+        failed = 0
+        for r, name in ((registry, "a"), (unused, "b"), (cue.SchemaRegistry(), None)):
+            try:
+                if name is None:
+                    r.add("c", "c: int")
+                    r.warm_up()
+                else:
+                    r[name].check({name: 1})
+            except RuntimeError:
+                continue
+            failed += 1
+        os._exit(failed)
+    _, status = os.waitpid(pid, 0)
+    assert os.waitstatus_to_exitcode(status) == 0
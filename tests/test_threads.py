@@ -0,0 +1,112 @@
+# Copyright 2024 The CUE Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# 	http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Concurrent use of cue.Context and cue.Value.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import cue
+
+THREADS = 16
+ITERATIONS = 200
+
+def hammer(fn):
+    barrier = threading.Barrier(THREADS)
+
+    def run(i):
+        barrier.wait()
+        for j in range(ITERATIONS):
+            fn(i, j)
+
+    with ThreadPoolExecutor(max_workers=THREADS) as ex:
+        for f in [ex.submit(run, i) for i in range(THREADS)]:
+            f.result()
+
+def test_stress():
+    ctx = cue.Context()
+    schema = ctx.compile("x: int, y: z: string")
+
+    def work(i, j):
+        v = schema.unify(ctx.compile(f'x: {i}, y: z: "{j}"'))
+        v.validate(cue.Concrete(True))
+        assert v.lookup("x").to_int() == i
+        assert v.lookup("y.z").to_str() == str(j)
+        ctx.to_value({"x": j, "y": {"z": "a"}}).check_schema(schema)
+
+    hammer(work)
+
+def test_concurrent_close():
+    ctx = cue.Context()
+    vals = [ctx.to_value(i) for i in range(ITERATIONS)]
+
+    # every thread tries to close every value: each handle must be
+    # released exactly once.
+    hammer(lambda i, j: vals[j].close())
+    assert all(v._val == 0 for v in vals)
+
+def test_concurrent_flush():
+    ctx = cue.Context()
+
+    def work(i, j):
+        ctx.to_value(j)
+        if j % 10 == 0:
+            ctx.flush()
+
+    hammer(work)
+    ctx.flush()
+    assert ctx.pending_releases() == 0
+
+def test_map_validate():
+    ctx = cue.Context()
+    schema = ctx.compile("x: int")
+
+    records = [{"x": i} if i % 3 else {"x": str(i)} for i in range(100)]
+    res = ctx.map_validate(records, schema=schema, max_workers=4, chunksize=7)
+    assert len(res) == 100
+    for i, r in enumerate(res):
+        assert isinstance(r, cue.Ok if i % 3 else cue.Err)
+
+    res = ctx.map_validate([ctx.compile("1"), ctx.compile("int")], cue.Concrete(True))
+    assert isinstance(res[0], cue.Ok)
+    assert isinstance(res[1], cue.Err)
+
+    with ThreadPoolExecutor(max_workers=2) as ex:
+        res = ctx.map_validate([b'{"x": 1}', b'{"x": true}'], schema=schema, executor=ex)
+    assert isinstance(res[0], cue.Ok)
+    assert isinstance(res[1], cue.Err)
+
+def test_concurrent_push(monkeypatch):
+    from cue.res import _ReleaseQueue
+    freed = []
+
+    def free_all(handles):
+        i = 0
+        while handles[i] != 0:
+            freed.append(handles[i])
+            i += 1
+    monkeypatch.setattr(cue.res.libcue, "free_all", free_all)
+
+    # pushes race with threshold and explicit flushes: every handle
+    # must be released exactly once.
+    q = _ReleaseQueue(7)
+    def work(i, j):
+        q.push(i * ITERATIONS + j + 1)
+        if j % 13 == 0:
+            q.flush()
+
+    hammer(work)
+    q.flush()
+    assert sorted(freed) == list(range(1, THREADS * ITERATIONS + 1))
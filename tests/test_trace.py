@@ -0,0 +1,71 @@
+# Copyright 2024 The CUE Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# 	http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Tracing tests.
+"""
+
+from typing import Iterator
+import pytest
+import cue
+
+@pytest.fixture
+def tracer() -> Iterator[cue.RecordingTracer]:
+    t = cue.RecordingTracer()
+    cue.set_tracer(t)
+    try:
+        yield t
+    finally:
+        cue.set_tracer(None)
+
+def test_no_tracer():
+    assert cue.get_tracer() is None
+    ctx = cue.Context()
+    assert ctx.compile("x: 1").lookup("x").to_int() == 1
+
+def test_spans(tracer: cue.RecordingTracer):
+    ctx = cue.Context()
+    src = "x: int"
+    schema = ctx.compile(src, cue.FileName("schema.cue"))
+    val = schema.unify(ctx.compile("x: 1"))
+    val.validate(cue.Concrete(True))
+    val.check_schema(schema)
+    assert val.to_json() == '{"x":1}'
+    assert val.to_json_bytes() == b'{"x":1}'
+
+    compile = tracer.spans("cue.compile")
+    assert len(compile) == 2
+    assert compile[0].attributes["cue.source.size"] == len(src)
+    assert compile[0].attributes["cue.options"] == [repr(cue.FileName("schema.cue"))]
+    assert compile[0].attributes["cue.error"] is False
+    assert compile[0].end is not None and compile[0].duration >= 0
+
+    assert len(tracer.spans("cue.unify")) == 1
+    assert tracer.spans("cue.validate")[0].attributes["cue.options"] == [repr(cue.Concrete(True))]
+    assert tracer.spans("cue.check_schema")[0].attributes["cue.options"] == []
+    assert [s.attributes["cue.output.size"] for s in tracer.spans("cue.to_json")] == [7, 7]
+    assert len(tracer.spans()) == 7
+
+    tracer.clear()
+    assert tracer.spans() == []
+
+def test_span_error(tracer: cue.RecordingTracer):
+    ctx = cue.Context()
+    with pytest.raises(cue.Error):
+        ctx.compile("x: {")
+
+    [span] = tracer.spans("cue.compile")
+    assert span.attributes["cue.error"] is True
+    assert span.attributes["cue.error.message"]
+    assert isinstance(span.exception, cue.Error)
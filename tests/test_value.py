@@ -16,6 +16,8 @@
 cue.Value tests.
 """
 
+import decimal
+import io
 import pytest
 import cue
 
@@ -61,6 +63,50 @@ def test_not_equal():
     val6 = ctx.compile("true")
     assert val6 != True
 
+def test_fingerprint():
+    ctx = cue.Context()
+
+    a = ctx.compile('x: 1, y: { b: "hello", a: [1, 2.5] }')
+    b = ctx.compile('y: { a: [1, 2.5], b: "hello" }, x: 1.0')
+    c = ctx.compile('x: 2, y: { b: "hello", a: [1, 2.5] }')
+    fp = a.fingerprint()
+    assert fp is not None and len(fp) == 16
+    assert a.fingerprint() is fp
+    assert fp == b.fingerprint()
+    assert fp != c.fingerprint()
+
+    assert ctx.compile("x: int").fingerprint() is None
+    # defaults are not concrete values.
+    assert ctx.compile("*1 | int").fingerprint() is None
+
+def test_hash():
+    ctx = cue.Context()
+
+    a = ctx.compile("x: 1")
+    b = ctx.compile("x: 1")
+    c = ctx.compile("x: 2")
+    assert hash(a) == hash(b)
+    assert len({a, b, c}) == 2
+    assert {a: "a"}[b] == "a"
+
+    # non-concrete values hash too.
+    for src in ["int", "{a: int}", "*1 | int"]:
+        v = ctx.compile(src)
+        assert v.fingerprint() is None
+        assert hash(v) == hash(v) == hash(ctx.compile(src))
+    assert hash(ctx.compile("*1 | int")) != hash(ctx.compile("*2 | int"))
+    assert hash(ctx.compile("*1 | int")) != hash(ctx.compile("1"))
+
+    # once hashed, a value keeps its hash after it is released.
+    d = ctx.compile("x: 3")
+    h = hash(d)
+    d.close()
+    assert hash(d) == h
+    e = ctx.compile("x: 4")
+    e.close()
+    with pytest.raises(RuntimeError):
+        hash(e)
+
 def test_unify():
     ctx = cue.Context()
 
@@ -125,6 +171,85 @@ def test_decode():
     val = ctx.compile("x: { a: 1, b: true }")
     assert val.to_json() == r'{"x":{"a":1,"b":true}}'
 
+def test_to_json_bytes():
+    ctx = cue.Context()
+
+    val = ctx.compile('x: { a: 1, b: "héllo" }')
+    assert val.to_json_bytes() == '{"x":{"a":1,"b":"héllo"}}'.encode("utf-8")
+
+    with pytest.raises(cue.Error):
+        ctx.compile("x: int").to_json_bytes()
+
+def test_write_json():
+    ctx = cue.Context()
+    val = ctx.compile("x: { a: 1, b: true }")
+    want = b'{"x":{"a":1,"b":true}}'
+
+    f = io.BytesIO()
+    assert val.write_json(f) == len(want)
+    assert f.getvalue() == want
+
+    buf = bytearray(64)
+    assert val.write_json(buf) == len(want)
+    assert buf[:len(want)] == want
+
+    buf = bytearray(64)
+    assert val.write_json(memoryview(buf)[8:]) == len(want)
+    assert buf[8:8+len(want)] == want
+
+    with pytest.raises(ValueError):
+        val.write_json(bytearray(4))
+
+def test_write_json_short_writes():
+    ctx = cue.Context()
+    val = ctx.compile("x: { a: 1, b: true }")
+    want = b'{"x":{"a":1,"b":true}}'
+
+    class Raw:
+        # a non-blocking raw file taking 4 bytes per write, until
+        # its buffer is full.
+        def __init__(self, room):
+            self.data = bytearray()
+            self.room = room
+
+        def write(self, b):
+            if self.room == 0:
+                return None
+            k = min(4, len(b), self.room)
+            self.data += b[:k]
+            self.room -= k
+            return k
+
+    f = Raw(100)
+    assert val.write_json(f) == len(want)
+    assert f.data == want
+
+    f = Raw(10)
+    with pytest.raises(BlockingIOError) as e:
+        val.write_json(f)
+    assert e.value.characters_written == 10
+    assert f.data == want[:10]
+
+def test_to_python():
+    ctx = cue.Context()
+
+    val = ctx.compile("x: { a: 1, b: true }")
+    assert val.to_python() == {"x": {"a": 1, "b": True}}
+
+    val = ctx.compile('[1, "two", null, 3.5, { x: [] }]')
+    assert val.to_python() == [1, "two", None, 3.5, {"x": []}]
+
+    assert ctx.compile("42").to_python() == 42
+    assert ctx.compile('"hello"').to_python() == "hello"
+    assert ctx.compile("'world'").to_python() == b"world"
+    assert ctx.compile("'world'").to_python(decode_bytes=False) == "d29ybGQ="
+
+    val = ctx.compile("x: 1.5, y: 2")
+    assert val.to_python(parse_float=decimal.Decimal, parse_int=str) == {"x": decimal.Decimal("1.5"), "y": "2"}
+
+    with pytest.raises(cue.Error):
+        ctx.compile("x: int").to_python()
+
 def test_decode_error():
     ctx = cue.Context()
 
@@ -150,6 +275,81 @@ def test_lookup():
     assert val.lookup("x").lookup("y").lookup("b").to_str() == "hello"
     assert val.lookup("x.y.a").to_int() == 1
 
+def test_lookup_path():
+    ctx = cue.Context()
+
+    p = ctx.path("x.y.a")
+    assert p == cue.Path("x.y.a") and str(p) == "x.y.a"
+
+    for src in (r'x: y: { a: 1, b: "hello"}', r'x: y: { a: 2 }'):
+        val = ctx.compile(src)
+        assert val.lookup(p).to_int() == val.lookup("x.y.a").to_int()
+
+    with pytest.raises(cue.Error):
+        ctx.compile("x: 1").lookup(p)
+
+def test_lookup_many():
+    ctx = cue.Context()
+
+    val = ctx.compile(r'x: y: { a: 1, b: "hello"}')
+    res = val.lookup_many(["x.y.a", ctx.path("x.y.b"), "x.z", ctx.path("x.y")])
+    assert len(res) == 4
+    assert isinstance(res[0], cue.Ok) and res[0].value.to_int() == 1
+    assert isinstance(res[1], cue.Ok) and res[1].value.to_str() == "hello"
+    assert isinstance(res[2], cue.Err)
+    assert isinstance(res[3], cue.Ok) and res[3].value == ctx.compile(r'{ a: 1, b: "hello" }')
+
+    assert val.lookup_many([]) == []
+
+def test_extract():
+    ctx = cue.Context()
+
+    val = ctx.compile(r'''
+        name: "hello"
+        port: 8080
+        ratio: 0.5
+        debug: true
+        data: 'world'
+        none: null
+        n: 3
+        tags: ["a", "b"]
+        meta: { x: 1 }
+        open: int
+    ''')
+    res = val.extract({
+        "name": cue.Kind.STRING,
+        ctx.path("port"): cue.Kind.INT,
+        "ratio": cue.Kind.FLOAT,
+        "debug": cue.Kind.BOOL,
+        "data": cue.Kind.BYTES,
+        "none": cue.Kind.NULL,
+        "n": cue.Kind.NUMBER,
+        "tags": cue.Kind.LIST,
+        "meta": cue.Kind.TOP,
+        "missing": cue.Kind.INT,
+        "open": cue.Kind.INT,
+        "debug.x": cue.Kind.BOOL,
+        ctx.path("name"): cue.Kind.STRUCT,
+    })
+
+    assert res["name"] == cue.Ok("hello")
+    assert res[ctx.path("port")] == cue.Ok(8080)
+    assert res["ratio"] == cue.Ok(0.5)
+    assert res["debug"] == cue.Ok(True)
+    assert res["data"] == cue.Ok(b"world")
+    assert res["none"] == cue.Ok(None)
+    assert res["n"] == cue.Ok(3)
+    assert res["tags"] == cue.Ok(["a", "b"])
+    assert res["meta"] == cue.Ok({"x": 1})
+    assert isinstance(res["missing"], cue.Err)
+    assert isinstance(res["open"], cue.Err)
+    assert isinstance(res["debug.x"], cue.Err)
+    assert res[ctx.path("name")] == cue.Err("expected struct, found string")
+
+    res = val.extract({"port": cue.Kind.STRING, "name": cue.Kind.NULL})
+    assert isinstance(res["port"], cue.Err)
+    assert res["name"] == cue.Err("expected null, found string")
+
 def test_default():
     ctx = cue.Context()
 
@@ -228,6 +428,45 @@ def test_check_schema_error():
     with pytest.raises(cue.Error):
         v.check_schema(s)
 
+def test_check_many():
+    ctx = cue.Context()
+
+    s = ctx.compile(r'{ x: int, y?: string }')
+    records = [
+        {"x": 1},
+        b'{"x": 2, "y": "hello"}',
+        ctx.compile("x: 3"),
+        {"x": "one"},
+        b'{"x": 1, "y": 2}',
+        b'{"x": ',
+    ]
+    res = s.check_many(records)
+    assert len(res) == 6
+    assert res.ok == [True, True, True, False, False, False]
+    assert [i for i, _ in res.errors] == [3, 4, 5]
+    assert res.passed == 3 and res.failed == 3
+
+    res = ctx.validate_batch(s, [{"x": 1}, {}], cue.Concrete(True))
+    assert res.ok == [True, False]
+
+    res = s.check_many([])
+    assert len(res) == 0 and res.errors == []
+
+def test_check_many_unconvertible():
+    ctx = cue.Context()
+    s = ctx.compile("x: _")
+
+    # records with no CUE equivalent fail alone, with or without the
+    # validation cache.
+    records = [{"x": {1, 2}}, {"x": 1}, {"x": float("nan")}]
+    for c in (ctx, cue.Context(validation_cache_size=8)):
+        res = c.validate_batch(c.compile("x: _"), records)
+        assert res.ok[0] is False and res.ok[2] is False
+        assert [i for i, _ in res.errors] == [0, 2]
+
+    res = ctx.map_validate(records, schema=s)
+    assert isinstance(res[0], cue.Err) and isinstance(res[2], cue.Err)
+
 def test_validate():
     ctx = cue.Context()
 